@@ -5,9 +5,11 @@ Programme pour analyser les données des compagnies aériennes
 depuis le fichier flightradar24.csv et afficher le nom, le sigle et le nombre d'aircraft
 """
 
-import csv
-import pandas as pd
-import re
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'utils'))
+from airline_catalog import AirlineCatalog
 
 def analyser_airlines_csv(fichier_csv):
     """
@@ -17,40 +19,23 @@ def analyser_airlines_csv(fichier_csv):
         fichier_csv (str): Chemin vers le fichier CSV
     """
     try:
-        # Lire le fichier CSV
-        df = pd.read_csv(fichier_csv)
-        
-        # Les colonnes sont: "text-center href", "smalloperatorsymbol src", "notranslate", "text-right", "text-right 2"
-        # Nous nous intéressons aux colonnes: nom (notranslate), sigle (text-right), nombre d'aircraft (text-right 2)
-        
-        # Filtrer les lignes vides et les en-têtes
-        df_filtered = df.dropna(subset=['notranslate'])
-        df_filtered = df_filtered[df_filtered['notranslate'] != '']
-        df_filtered = df_filtered[df_filtered['notranslate'] != 'notranslate']
+        # Catalogue analysé une fois puis relu depuis son cache binaire
+        catalog = AirlineCatalog.load(fichier_csv)
         
         print("=" * 80)
         print("ANALYSE DES COMPAGNIES AÉRIENNES - FLIGHTRADAR24")
         print("=" * 80)
-        print(f"{'NOM DE LA COMPAGNIE':<30} {'SIGLE':<15} {'NOMBRE D\'AIRCRAFT':<20}")
+        colonne_aircraft = "NOMBRE D'AIRCRAFT"
+        print(f"{'NOM DE LA COMPAGNIE':<30} {'SIGLE':<15} {colonne_aircraft:<20}")
         print("-" * 80)
         
         total_aircraft = 0
         nombre_compagnies = 0
         
-        for index, row in df_filtered.iterrows():
-            nom = str(row['notranslate']).strip()
-            sigle = str(row['text-right']).strip()
-            aircraft_info = str(row['text-right 2']).strip()
-            
-            # Extraire le nombre d'aircraft
-            if 'aircraft' in aircraft_info:
-                nombre_aircraft = re.findall(r'\d+', aircraft_info)
-                if nombre_aircraft:
-                    nombre_aircraft_int = int(nombre_aircraft[0])
-                    total_aircraft += nombre_aircraft_int
-                    nombre_compagnies += 1
-                    
-                    print(f"{nom:<30} {sigle:<15} {aircraft_info:<20}")
+        for airline in catalog:
+            total_aircraft += airline.aircraft_count
+            nombre_compagnies += 1
+            print(f"{airline.name:<30} {airline.sigle:<15} {airline.aircraft_info:<20}")
         
         print("-" * 80)
         print(f"RÉSUMÉ:")
@@ -67,39 +52,14 @@ def analyser_airlines_csv(fichier_csv):
 
 def analyser_avec_csv_reader(fichier_csv):
     """
-    Alternative avec le module csv standard pour une lecture plus robuste
+    Affiche les compagnies triées par nombre d'aircraft (décroissant)
     
     Args:
         fichier_csv (str): Chemin vers le fichier CSV
     """
     try:
-        airlines_data = []
-        
-        with open(fichier_csv, 'r', encoding='utf-8') as file:
-            csv_reader = csv.reader(file)
-            
-            # Ignorer les deux premières lignes (en-têtes)
-            next(csv_reader, None)
-            next(csv_reader, None)
-            
-            for row in csv_reader:
-                if len(row) >= 5 and row[2] and row[2] != '' and 'aircraft' in row[4]:
-                    nom = row[2].strip()
-                    sigle = row[3].strip()
-                    aircraft_info = row[4].strip()
-                    
-                    # Extraire le nombre d'aircraft
-                    nombre_aircraft = re.findall(r'\d+', aircraft_info)
-                    if nombre_aircraft:
-                        airlines_data.append({
-                            'nom': nom,
-                            'sigle': sigle,
-                            'aircraft_count': int(nombre_aircraft[0]),
-                            'aircraft_info': aircraft_info
-                        })
-        
         # Trier par nombre d'aircraft (décroissant)
-        airlines_data.sort(key=lambda x: x['aircraft_count'], reverse=True)
+        airlines_data = sorted(AirlineCatalog.load(fichier_csv), key=lambda x: x.aircraft_count, reverse=True)
         
         print("=" * 80)
         print("COMPAGNIES AÉRIENNES TRIÉES PAR NOMBRE D'AIRCRAFT")
@@ -109,8 +69,8 @@ def analyser_avec_csv_reader(fichier_csv):
         
         total_aircraft = 0
         for airline in airlines_data:
-            print(f"{airline['nom']:<30} {airline['sigle']:<15} {airline['aircraft_count']:<10} {airline['aircraft_info']:<20}")
-            total_aircraft += airline['aircraft_count']
+            print(f"{airline.name:<30} {airline.sigle:<15} {airline.aircraft_count:<10} {airline.aircraft_info:<20}")
+            total_aircraft += airline.aircraft_count
         
         print("-" * 80)
         print(f"STATISTIQUES:")
@@ -118,8 +78,8 @@ def analyser_avec_csv_reader(fichier_csv):
         print(f"Total aircraft: {total_aircraft}")
         if airlines_data:
             print(f"Moyenne par compagnie: {total_aircraft/len(airlines_data):.1f}")
-            print(f"Compagnie avec le plus d'aircraft: {airlines_data[0]['nom']} ({airlines_data[0]['aircraft_count']} aircraft)")
-            print(f"Compagnie avec le moins d'aircraft: {airlines_data[-1]['nom']} ({airlines_data[-1]['aircraft_count']} aircraft)")
+            print(f"Compagnie avec le plus d'aircraft: {airlines_data[0].name} ({airlines_data[0].aircraft_count} aircraft)")
+            print(f"Compagnie avec le moins d'aircraft: {airlines_data[-1].name} ({airlines_data[-1].aircraft_count} aircraft)")
         print("=" * 80)
         
     except FileNotFoundError:
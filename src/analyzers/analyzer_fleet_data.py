@@ -6,12 +6,17 @@ Analyseur des données de flotte scrapées depuis FlightRadar24
 
 import pandas as pd
 import json
+import os
+import sys
 import matplotlib.pyplot as plt
 import seaborn as sns
 from collections import Counter
 import numpy as np
 import streamlit as st
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'utils'))
+from columnar import has_fresh_parquet, read_table
+
 class FleetDataAnalyzer:
     def __init__(self, csv_file='fleet_data_2800.csv'):
         self.csv_file = csv_file
@@ -19,10 +24,11 @@ class FleetDataAnalyzer:
         self.load_data()
 
     def load_data(self):
-        """Charge les données depuis le fichier CSV uniquement"""
+        """Charge les données depuis le CSV, ou sa version Parquet si elle est à jour"""
         try:
-            self.df = pd.read_csv(self.csv_file)
-            print(f"Données CSV chargées: {len(self.df)} lignes")
+            source = 'Parquet' if has_fresh_parquet(self.csv_file) else 'CSV'
+            self.df = read_table(self.csv_file)
+            print(f"Données {source} chargées: {len(self.df)} lignes")
         except FileNotFoundError as e:
             print(f"Fichier non trouvé: {e}")
         except Exception as e:
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Enrichissement optionnel des aircraft via leurs pages de détail (/data/aircraft/{registration})
+
+Seuls les aircraft dont le numéro de série ou l'âge manque dans le tableau de
+flotte sont concernés. Chaque registration n'est récupérée qu'une fois : les
+doublons (même avion sous plusieurs compagnies) sont regroupés avant les
+requêtes, et les détails obtenus sont conservés dans un cache SQLite partagé
+entre les runs.
+"""
+
+import json
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+
+from fleet_records import is_missing
+
+# Libellés de la page de détail -> champs de aircraft_details
+DETAIL_LABELS = {
+    'SERIAL NUMBER (MSN)': 'serial_number',
+    'MSN': 'serial_number',
+    'AGE': 'age',
+    'AIRCRAFT': 'detailed_type',
+    'TYPE CODE': 'type_code',
+    'MODE S': 'mode_s',
+}
+ENRICHED_FIELDS = ('serial_number', 'age')
+
+
+def parse_aircraft_html(content):
+    """Extrait les couples libellé/valeur d'une page de détail d'aircraft"""
+    soup = BeautifulSoup(content, 'html.parser', parse_only=SoupStrainer(['label', 'span']))
+    details = {}
+    for label in soup.find_all('label'):
+        field = DETAIL_LABELS.get(label.text.strip().upper())
+        value = label.find_next_sibling('span')
+        if field and value is not None and not is_missing(value.text) and field not in details:
+            details[field] = value.text.strip()
+    return details
+
+
+class AircraftDetailCache:
+    """Cache SQLite des détails d'aircraft, indexé par registration"""
+
+    def __init__(self, db_path, max_age_days=90):
+        self.db_path = db_path
+        self.max_age = max_age_days * 86400
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS aircraft (
+                registration TEXT PRIMARY KEY,
+                details TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+
+    def lookup_many(self, registrations):
+        """Détails encore valides pour les registrations demandées"""
+        found = {}
+        oldest = time.time() - self.max_age
+        registrations = list(registrations)
+        # Par paquets pour rester sous la limite de variables SQLite
+        for i in range(0, len(registrations), 500):
+            chunk = registrations[i:i + 500]
+            rows = self.conn.execute(
+                f"SELECT registration, details FROM aircraft WHERE fetched_at >= ? "
+                f"AND registration IN ({','.join('?' * len(chunk))})",
+                [oldest] + chunk,
+            )
+            for registration, details in rows:
+                found[registration] = json.loads(details)
+        return found
+
+    def store(self, registration, details):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO aircraft (registration, details, fetched_at) VALUES (?, ?, ?)",
+            (registration, json.dumps(details, ensure_ascii=False), time.time()),
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+class EnrichedResults:
+    """Vue ré-itérable sur des résultats, complétés à la volée avec les détails récupérés"""
+
+    def __init__(self, results, details):
+        self.results = results
+        self.details = details
+
+    def __iter__(self):
+        for airline in self.results:
+            for aircraft in airline.iter_aircraft():
+                fetched = self.details.get(aircraft.registration)
+                if not fetched:
+                    continue
+                for field, value in fetched.items():
+                    if is_missing(aircraft.get(field)):
+                        aircraft.set(field, value)
+            yield airline
+
+    def __len__(self):
+        return len(self.results)
+
+
+class AircraftEnricher:
+    """Récupère les pages de détail manquantes via un pool de threads borné.
+
+    Les requêtes passent par la session, le contrôleur de débit et les
+    métriques du scraper : l'enrichissement partage le même budget de débit.
+    """
+
+    def __init__(self, scraper, cache=None, workers=4, max_retries=3):
+        self.scraper = scraper
+        self.cache = cache
+        self.workers = workers
+        self.max_retries = max_retries
+
+    def missing_registrations(self, results):
+        """Registrations uniques dont au moins un champ enrichissable manque"""
+        registrations = set()
+        for airline in results:
+            if not airline.ok:
+                continue
+            for aircraft in airline.iter_aircraft():
+                if is_missing(aircraft.registration):
+                    continue
+                if any(is_missing(aircraft.get(field)) for field in ENRICHED_FIELDS):
+                    registrations.add(aircraft.registration)
+        return registrations
+
+    def fetch(self, registration):
+        """Détails d'une registration, ou None après max_retries échecs"""
+        url = f"{self.scraper.base_url}/data/aircraft/{registration.lower()}"
+        for attempt in range(1, self.max_retries + 1):
+            self.scraper.metrics.observe_sleep(self.scraper.rate_controller.wait())
+            start = time.monotonic()
+            try:
+                response = self.scraper.session.get(url, timeout=10)
+            except requests.exceptions.RequestException:
+                self.scraper.record_response(None, time.monotonic() - start)
+                continue
+            self.scraper.record_response(response.status_code, time.monotonic() - start,
+                                         response.headers.get('Retry-After'))
+            if response.status_code == 404:
+                return {}
+            if response.ok:
+                self.scraper.metrics.observe_bytes(len(response.content))
+                return parse_aircraft_html(response.content)
+            if attempt < self.max_retries:
+                self.scraper.metrics.observe_retry()
+        return None
+
+    def enrich(self, results):
+        """Complète les champs manquants ; renvoie une vue ré-itérable sur les résultats"""
+        needed = self.missing_registrations(results)
+        details = self.cache.lookup_many(needed) if self.cache else {}
+        to_fetch = sorted(needed - details.keys())
+        print(f"[ENRICH] {len(needed)} registrations à compléter, {len(details)} en cache, "
+              f"{len(to_fetch)} à récupérer ({self.workers} workers)")
+
+        failed = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self.fetch, registration): registration for registration in to_fetch}
+            for i, future in enumerate(as_completed(futures), 1):
+                registration = futures[future]
+                fetched = future.result()
+                if fetched is None:
+                    failed += 1
+                    continue
+                details[registration] = fetched
+                # Écritures SQLite dans le thread principal uniquement
+                if self.cache:
+                    self.cache.store(registration, fetched)
+                if i % 100 == 0:
+                    print(f"[ENRICH] {i}/{len(to_fetch)} pages de détail traitées")
+
+        if failed:
+            print(f"[ENRICH] {failed} registrations non récupérées (seront retentées au prochain run)")
+        return EnrichedResults(results, details)
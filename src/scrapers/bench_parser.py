@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark des moteurs de parsing des pages de flotte
+
+Usage :
+    python src/scrapers/bench_parser.py                      # pages synthétiques
+    python src/scrapers/bench_parser.py --pages data/samples # pages sauvegardées (*.html)
+"""
+
+import argparse
+import glob
+import os
+import random
+import time
+import tracemalloc
+
+from fleet_parser import ENGINES, lxml, parse_fleet_html
+
+AIRCRAFT_TYPES = [
+    ('A320', 'Airbus A320-214'), ('A321', 'Airbus A321-211'), ('B738', 'Boeing 737-8AS'),
+    ('B77W', 'Boeing 777-3ZG(ER)'), ('AT76', 'ATR 72-600'), ('DH8D', 'De Havilland Canada Dash 8-400'),
+    ('E190', 'Embraer E190LR'), ('C208', 'Cessna 208B Grand Caravan'), ('B762', 'Boeing 767-241(ER)(BDSF)'),
+]
+
+
+def generate_fleet_page(airline_code, n_aircraft, seed=None):
+    """Génère une page de flotte au format FlightRadar24 (structure dl#list-aircraft)"""
+    rng = random.Random(seed if seed is not None else airline_code)
+    n_types = max(1, min(len(AIRCRAFT_TYPES), rng.randint(1, 4)))
+    types = rng.sample(AIRCRAFT_TYPES, n_types)
+    counts = [n_aircraft // n_types] * n_types
+    counts[0] += n_aircraft - sum(counts)
+
+    parts = ['<!DOCTYPE html><html><head><title>Fleet</title>',
+             '<script>var config = {"airline": "%s"};</script></head><body>' % airline_code]
+    # Contenu de navigation, comme sur les vraies pages
+    parts.append('<nav><ul>%s</ul></nav>' % ''.join(
+        '<li><a href="/data/airlines/%d"><span class="menu">Menu %d</span></a></li>' % (i, i) for i in range(200)))
+    parts.append('<span class="number-of-aircraft">Fleet size <strong>%d</strong></span>' % n_aircraft)
+    parts.append('<dl id="list-aircraft"><dt class="header"><div>Aircraft type</div><div>Count</div></dt>')
+    for (type_code, type_name), count in zip(types, counts):
+        parts.append('<dt class="parent"><div class="col-xs-10">%s</div><div class="col-xs-2">%d</div></dt>'
+                     % (type_name, count))
+        parts.append('<dd><table class="table"><thead><tr><th>Reg</th><th>Type</th><th>MSN</th><th>Age</th></tr>'
+                     '</thead><tbody>')
+        for _ in range(count):
+            registration = '%s-%s' % (rng.choice('FDGN'), ''.join(rng.choice('ABCDEFGHKLMNPRSTUVWXYZ') for _ in range(4)))
+            # Comme sur le site, numéro de série et âge ne sont pas toujours renseignés
+            serial_number = str(rng.randint(1000, 9999)) if rng.random() > 0.1 else '-'
+            age = '%.1f years' % rng.uniform(0, 30) if rng.random() > 0.1 else '-'
+            parts.append('<tr><td><a class="regLinks" href="/data/aircraft/%s">%s</a></td><td>%s</td>'
+                         '<td>%s</td><td>%s</td></tr>'
+                         % (registration.lower(), registration, type_code, serial_number, age))
+        parts.append('</tbody></table></dd>')
+    parts.append('</dl><footer>%s</footer></body></html>' % ('<p>footer</p>' * 100))
+    return ''.join(parts).encode('utf-8')
+
+
+def generate_aircraft_page(registration):
+    """Génère une page de détail d'aircraft (libellés <label> suivis de <span class="details">)"""
+    rng = random.Random(registration)
+    type_code, type_name = rng.choice(AIRCRAFT_TYPES)
+    fields = [('AIRCRAFT', type_name), ('TYPE CODE', type_code), ('MODE S', '%06X' % rng.randint(0, 0xFFFFFF)),
+              ('SERIAL NUMBER (MSN)', str(rng.randint(1000, 9999))), ('AGE', '%.1f years' % rng.uniform(0, 30))]
+    rows = ''.join('<div class="row"><label>%s</label><span class="details">%s</span></div>' % field
+                   for field in fields)
+    return ('<!DOCTYPE html><html><body><h1>%s</h1>%s</body></html>' % (registration.upper(), rows)).encode('utf-8')
+
+
+def load_pages(pages_dir, count):
+    if pages_dir:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(pages_dir, '*.html'))):
+            with open(path, 'rb') as f:
+                pages.append(f.read())
+        return pages
+    rng = random.Random(42)
+    # Distribution proche du catalogue : beaucoup de petites flottes, quelques grosses
+    return [generate_fleet_page(f'ai{i}', int(rng.paretovariate(1.2) * 2), seed=i) for i in range(count)]
+
+
+def bench_engine(engine, pages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            parse_fleet_html(page, engine)
+    elapsed = time.perf_counter() - start
+
+    peak = 0
+    for page in pages:
+        tracemalloc.start()
+        parse_fleet_html(page, engine)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return len(pages) * repeat / elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des moteurs de parsing des pages de flotte")
+    parser.add_argument('--pages', help="Dossier de pages HTML sauvegardées (*.html)")
+    parser.add_argument('--count', type=int, default=200, help="Nombre de pages synthétiques")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages, args.count)
+    if not pages:
+        print("Aucune page à parser.")
+        return
+    engines = [engine for engine in ENGINES if engine != 'lxml' or lxml is not None]
+    reference = [parse_fleet_html(page, 'html.parser') for page in pages]
+    total_kb = sum(len(page) for page in pages) / 1024
+    print(f"{len(pages)} pages ({total_kb:.0f} Ko), {args.repeat} passes")
+    print(f"{'MOTEUR':<14} {'PAGES/S':>10} {'PIC MÉMOIRE':>14} {'IDENTIQUE':>10}")
+    print("-" * 52)
+    for engine in engines:
+        identical = all(parse_fleet_html(page, engine) == ref for page, ref in zip(pages, reference))
+        pages_per_sec, peak = bench_engine(engine, pages, args.repeat)
+        print(f"{engine:<14} {pages_per_sec:>10.1f} {peak / 1024:>11.0f} Ko {'oui' if identical else 'NON':>10}")
+    print("Pic mémoire mesuré avec tracemalloc (allocations Python uniquement, hors mémoire C de lxml).")
+
+
+if __name__ == "__main__":
+    main()
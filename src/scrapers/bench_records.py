@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mesure mémoire : résultats en dicts imbriqués vs enregistrements compacts (fleet_records)
+
+Usage :
+    python src/scrapers/bench_records.py                   # catalogue complet synthétique
+    python src/scrapers/bench_records.py --json data/processed/fleet_data_complete.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import tracemalloc
+
+from bench_parser import generate_fleet_page
+from fleet_parser import parse_fleet_html
+from fleet_records import AirlineResult
+from replay_server import synthetic_fleet_size
+
+DEFAULT_CATALOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..',
+                               'data', 'raw', 'flightradar24.csv')
+
+
+def synthetic_payloads(n_airlines):
+    """Résultats JSON d'un catalogue synthétique (tailles de flotte du serveur de replay)"""
+    payloads = []
+    for i in range(n_airlines):
+        code = f"r{i:05d}"
+        total, fleet = parse_fleet_html(generate_fleet_page(code, synthetic_fleet_size(code)), 'auto')
+        result = AirlineResult.from_parsed(code, f"Replay Airline {i}", total, fleet)
+        result.original_sigle = f"R{i % 10} / R{i:04d}"
+        result.original_aircraft_info = f"{total} aircraft"
+        result.scraped_at = '2025-08-04T12:00:00'
+        payloads.append(json.dumps(result.to_dict(), ensure_ascii=False))
+    return payloads
+
+
+def measure(build, payloads):
+    """Mémoire retenue par la structure construite à partir des payloads JSON"""
+    gc.collect()
+    tracemalloc.start()
+    data = build(payloads)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return data, current
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mémoire des résultats : dicts vs enregistrements compacts")
+    parser.add_argument('--json', help="Résultats existants (fleet_data_complete.json)")
+    parser.add_argument('--airlines', type=int, default=None,
+                        help="Nombre de compagnies synthétiques (défaut : taille du catalogue)")
+    args = parser.parse_args()
+
+    if args.json:
+        with open(args.json, encoding='utf-8') as f:
+            payloads = [json.dumps(result, ensure_ascii=False) for result in json.load(f)]
+    else:
+        n_airlines = args.airlines
+        if n_airlines is None:
+            with open(DEFAULT_CATALOG, encoding='utf-8') as f:
+                n_airlines = max(0, sum(1 for _ in f) - 2)
+        payloads = synthetic_payloads(n_airlines)
+
+    dicts, dict_bytes = measure(lambda items: [json.loads(item) for item in items], payloads)
+    records, record_bytes = measure(lambda items: [AirlineResult.from_dict(json.loads(item)) for item in items],
+                                    payloads)
+
+    # Conversion sans perte vers la forme JSON historique
+    lossless = all(record.to_dict() == data for record, data in zip(records, dicts))
+    n_aircraft = sum(1 for record in records for _ in record.iter_aircraft())
+    print(f"{len(records)} compagnies, {n_aircraft} aircraft")
+    print(f"dicts imbriqués         : {dict_bytes / 1024 ** 2:8.1f} Mo")
+    print(f"enregistrements compacts: {record_bytes / 1024 ** 2:8.1f} Mo "
+          f"({(1 - record_bytes / dict_bytes) * 100 if dict_bytes else 0:.0f}% de moins)")
+    print(f"Conversion sans perte : {'OK' if lossless else 'ÉCHEC'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de débit du scraper FlightRadar24 contre le serveur de replay local
+
+Usage :
+    python src/scrapers/bench_scraper.py --airlines 500 --modes sync,async --concurrency 4,16 \\
+        --parsers html.parser,lxml --latency-ms 50 --error-429 0.01 --json bench.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from fleet_parser import lxml
+from rate_limit import AIMDRateController
+from replay_server import ReplayServer, write_catalog
+from scraper_flightradar24 import FlightRadar24Scraper
+from telegram_reporter import TelegramReporter
+
+
+class TimedRateController(AIMDRateController):
+    """Contrôleur de débit qui conserve la latence de chaque requête"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latencies = []
+
+    def record(self, status, latency, retry_after=None):
+        self.latencies.append(latency)
+        super().record(status, latency, retry_after)
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def run_case(server, catalog, workdir, mode, parser_engine, concurrency, max_rps, trace_memory):
+    controller = TimedRateController(initial_rate=max_rps, max_rate=max_rps)
+    output_dir = os.path.join(workdir, f"{mode}_{parser_engine}_{concurrency}")
+    os.makedirs(output_dir, exist_ok=True)
+    # Fichiers partiels dans le dossier temporaire, et aucun rapport Telegram : un
+    # benchmark ne doit toucher ni data/processed ni le chat de production
+    scraper = FlightRadar24Scraper(parser_engine=parser_engine, rate_controller=controller, output_dir=output_dir,
+                                   reporter=TelegramReporter(enabled=False))
+    scraper.base_url = server.url
+    checkpoint = os.path.join(output_dir, 'checkpoint.sqlite')
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    # Les messages de progression du scraper fausseraient la mesure
+    with contextlib.redirect_stdout(io.StringIO()):
+        if mode == 'async':
+            results = scraper.scrape_all_airlines_async(catalog, concurrency=concurrency, checkpoint_path=checkpoint)
+        else:
+            results = scraper.scrape_all_airlines(catalog, checkpoint_path=checkpoint)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    if trace_memory:
+        tracemalloc.stop()
+    successes = sum(1 for result in results if result.ok)
+    parse = scraper.metrics.parse_time
+    return {
+        'mode': mode,
+        'parser': parser_engine,
+        'concurrency': concurrency if mode == 'async' else 1,
+        'airlines': len(results),
+        'success_rate': successes / len(results) if results else 0.0,
+        'airlines_per_sec': len(results) / elapsed if elapsed else 0.0,
+        'requests': len(controller.latencies),
+        'latency_p50_ms': percentile(controller.latencies, 0.50) * 1000,
+        'latency_p99_ms': percentile(controller.latencies, 0.99) * 1000,
+        'parse_ms_per_page': parse.sum / parse.count * 1000 if parse.count else 0.0,
+        'bytes_received': scraper.metrics.bytes_received,
+        'peak_memory_kb': peak / 1024 if peak is not None else None,
+        'elapsed_sec': elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du scraper FlightRadar24 (serveur de replay local)")
+    parser.add_argument('--airlines', type=int, default=300)
+    parser.add_argument('--modes', default='sync,async')
+    parser.add_argument('--concurrency', default='8', help="Liste de niveaux de concurrence (mode async)")
+    parser.add_argument('--parsers', default='html.parser,lxml' if lxml is not None else 'html.parser,strainer')
+    parser.add_argument('--pages', help="Dossier de pages enregistrées ({code}.html)")
+    parser.add_argument('--latency-ms', type=float, default=20.0)
+    parser.add_argument('--jitter-ms', type=float, default=5.0)
+    parser.add_argument('--error-429', type=float, default=0.0)
+    parser.add_argument('--error-5xx', type=float, default=0.0)
+    parser.add_argument('--max-rps', type=float, default=1000.0, help="Plafond du contrôleur de débit")
+    parser.add_argument('--trace-memory', action='store_true', help="Mesure le pic mémoire (tracemalloc, plus lent)")
+    parser.add_argument('--json', help="Écrit le rapport JSON à ce chemin")
+    args = parser.parse_args()
+
+    server = ReplayServer(pages_dir=args.pages, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                          error_429=args.error_429, error_5xx=args.error_5xx, retry_after=1).start()
+    reports = []
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            catalog = write_catalog(os.path.join(workdir, 'catalog.csv'), args.airlines)
+            for mode in args.modes.split(','):
+                levels = [int(level) for level in args.concurrency.split(',')] if mode == 'async' else [1]
+                for parser_engine in args.parsers.split(','):
+                    for concurrency in levels:
+                        reports.append(run_case(server, catalog, workdir, mode, parser_engine, concurrency,
+                                                args.max_rps, args.trace_memory))
+    finally:
+        server.stop()
+
+    print(f"{args.airlines} compagnies, latence {args.latency_ms:.0f}±{args.jitter_ms:.0f} ms, "
+          f"429 {args.error_429:.1%}, 5xx {args.error_5xx:.1%}")
+    print(f"{'MODE':<6} {'PARSER':<12} {'CONC':>4} {'CIES/S':>8} {'P50 MS':>8} {'P99 MS':>8} "
+          f"{'PARSE MS':>9} {'SUCCÈS':>7} {'MÉM KO':>8}")
+    print("-" * 80)
+    for report in reports:
+        memory = f"{report['peak_memory_kb']:.0f}" if report['peak_memory_kb'] is not None else '-'
+        print(f"{report['mode']:<6} {report['parser']:<12} {report['concurrency']:>4} "
+              f"{report['airlines_per_sec']:>8.1f} {report['latency_p50_ms']:>8.1f} {report['latency_p99_ms']:>8.1f} "
+              f"{report['parse_ms_per_page']:>9.2f} {report['success_rate']:>7.1%} {memory:>8}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, indent=2)
+        print(f"Rapport JSON écrit dans {args.json}")
+
+
+if __name__ == "__main__":
+    main()
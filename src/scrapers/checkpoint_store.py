@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Store de checkpoint SQLite pour les runs de scraping FlightRadar24
+"""
+
+import json
+import sqlite3
+import time
+
+from fleet_records import AirlineResult
+
+
+class CheckpointStore:
+    """Enregistre chaque résultat de compagnie dès qu'il est obtenu.
+
+    Une ligne par code compagnie : l'écriture coûte O(1) par compagnie au lieu
+    de re-sérialiser toute la liste, et un run interrompu peut reprendre en
+    sautant les codes déjà scrapés avec succès.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                code TEXT PRIMARY KEY,
+                position INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                scraped_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+
+    def record(self, result, position):
+        """Ajoute ou remplace le résultat d'une compagnie (commit immédiat)"""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO results (code, position, status, payload, scraped_at) VALUES (?, ?, ?, ?, ?)",
+            (result.code, position, result.status, json.dumps(result.to_dict(), ensure_ascii=False), time.time()),
+        )
+        self.conn.commit()
+
+    def done_codes(self):
+        """Codes déjà scrapés avec succès (les erreurs seront retentées)"""
+        rows = self.conn.execute("SELECT code FROM results WHERE status = 'success'")
+        return {code for (code,) in rows}
+
+    def iter_results(self):
+        """Parcourt les résultats dans l'ordre du catalogue, en une seule passe"""
+        for (payload,) in self.conn.execute("SELECT payload FROM results ORDER BY position"):
+            yield AirlineResult.from_dict(json.loads(payload))
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def clear(self):
+        """Vide le store pour un nouveau run complet"""
+        self.conn.execute("DELETE FROM results")
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+class StoredResults:
+    """Vue ré-itérable sur les résultats d'un store, relus à la demande.
+
+    Renvoyée par les méthodes de scraping à la place d'une liste : les
+    résultats ne sont jamais tous chargés en mémoire en même temps.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+
+    def __iter__(self):
+        store = CheckpointStore(self.db_path)
+        try:
+            yield from store.iter_results()
+        finally:
+            store.close()
+
+    def __len__(self):
+        store = CheckpointStore(self.db_path)
+        try:
+            return store.count()
+        finally:
+            store.close()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Mode delta : ne re-scrape que les compagnies nouvelles, modifiées ou trop anciennes
+"""
+
+import json
+import os
+import re
+import time
+from collections import Counter
+from datetime import datetime
+
+from fleet_records import AirlineResult
+
+
+def parse_aircraft_count(aircraft_info):
+    """Extrait N de la colonne catalogue "N aircraft" (None si absent)"""
+    match = re.search(r'\d+', aircraft_info or '')
+    return int(match.group()) if match else None
+
+
+def load_previous_results(json_path):
+    """Charge le résultat du run précédent, indexé par code compagnie.
+
+    Les résultats antérieurs au mode delta n'ont pas de 'scraped_at' : on leur
+    attribue la date de modification du fichier JSON.
+    """
+    if not os.path.exists(json_path):
+        return {}
+    with open(json_path, encoding='utf-8') as f:
+        results = json.load(f)
+    file_time = datetime.fromtimestamp(os.path.getmtime(json_path)).isoformat(timespec='seconds')
+    previous = {}
+    for data in results:
+        result = AirlineResult.from_dict(data)
+        result.scraped_at = result.scraped_at or file_time
+        previous[result.code] = result
+    return previous
+
+
+def select_delta_airlines(airline_codes, previous, max_age_days=30, now=None):
+    """Sélectionne les compagnies du catalogue à re-scraper.
+
+    Renvoie la liste des compagnies et un Counter des raisons :
+    nouvelle, nombre d'aircraft modifié, erreur au run précédent, ou résultat
+    plus vieux que max_age_days.
+    """
+    now = now or time.time()
+    max_age = max_age_days * 86400
+    selected = []
+    reasons = Counter()
+    for airline in airline_codes:
+        old = previous.get(airline['code'])
+        if old is None:
+            reason = 'nouvelle'
+        elif not old.ok:
+            reason = 'erreur'
+        elif parse_aircraft_count(old.original_aircraft_info) != parse_aircraft_count(airline['aircraft_info']):
+            reason = 'modifiée'
+        elif now - datetime.fromisoformat(old.scraped_at).timestamp() > max_age:
+            reason = 'ancienne'
+        else:
+            reasons['inchangée'] += 1
+            continue
+        reasons[reason] += 1
+        selected.append(airline)
+    return selected, reasons
+
+
+def merge_results(previous, fresh_results, airline_codes):
+    """Fusionne les nouveaux résultats dans le run précédent.
+
+    L'ordre suit le catalogue courant ; les compagnies du run précédent absentes
+    du catalogue sont conservées à la fin.
+    """
+    merged = dict(previous)
+    for result in fresh_results:
+        merged[result.code] = result
+    ordered = []
+    for airline in airline_codes:
+        result = merged.pop(airline['code'], None)
+        if result is not None:
+            ordered.append(result)
+    ordered.extend(merged.values())
+    return ordered
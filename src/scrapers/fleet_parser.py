@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parseurs des pages de flotte FlightRadar24 (/data/airlines/{code}/fleet)
+
+Tous les moteurs renvoient exactement le même couple (total_aircraft, fleet_details) :
+- "html.parser" : arbre BeautifulSoup complet (comportement historique)
+- "strainer"    : BeautifulSoup limité aux balises <span> et <dl> (SoupStrainer)
+- "lxml"        : parcours direct de l'arbre lxml, sans BeautifulSoup
+"""
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+ENGINES = ('html.parser', 'strainer', 'lxml')
+
+
+def default_engine():
+    """Moteur le plus rapide disponible"""
+    return 'lxml' if lxml is not None else 'strainer'
+
+
+def parse_fleet_html(content, engine='html.parser'):
+    """Extrait le nombre total d'aircraft et le détail de la flotte d'une page HTML"""
+    if engine == 'auto':
+        engine = default_engine()
+    if engine == 'html.parser':
+        return _extract_soup(BeautifulSoup(content, 'html.parser'))
+    if engine == 'strainer':
+        return _extract_soup(BeautifulSoup(content, 'html.parser', parse_only=SoupStrainer(['span', 'dl'])))
+    if engine == 'lxml':
+        if lxml is None:
+            raise RuntimeError("lxml n'est pas installé : pip install lxml")
+        return _extract_lxml(content)
+    raise ValueError(f"Moteur de parsing inconnu : {engine} (choix : {', '.join(ENGINES)}, auto)")
+
+
+def _extract_soup(soup):
+    # Extraire le nombre total d'aircraft
+    total_aircraft_span = soup.find('span', class_='number-of-aircraft')
+    total_aircraft = 0
+    if total_aircraft_span:
+        strong_tag = total_aircraft_span.find('strong')
+        if strong_tag:
+            total_aircraft = int(strong_tag.text.strip())
+    
+    # Extraire les détails de la flotte avec registrations
+    fleet_details = []
+    aircraft_list = soup.find('dl', id='list-aircraft')
+    
+    if aircraft_list:
+        # Trouver tous les éléments dt qui contiennent les types d'aircraft
+        aircraft_types = aircraft_list.find_all('dt')
+        
+        for dt in aircraft_types:
+            if 'header' not in dt.get('class', []):
+                divs = dt.find_all('div')
+                if len(divs) >= 2:
+                    aircraft_type = divs[0].text.strip()
+                    aircraft_count = divs[1].text.strip()
+                    
+                    try:
+                        count = int(aircraft_count)
+                        
+                        # Récupérer les détails des aircraft individuels
+                        aircraft_details = []
+                        dd = dt.find_next_sibling('dd')
+                        if dd:
+                            table = dd.find('table')
+                            if table:
+                                tbody = table.find('tbody')
+                                if tbody:
+                                    rows = tbody.find_all('tr')
+                                    for row in rows:
+                                        tds = row.find_all('td')
+                                        if len(tds) >= 2:
+                                            # Registration - extraire le texte de l'élément <a>
+                                            reg_cell = tds[0]
+                                            reg_link = reg_cell.find('a', class_='regLinks')
+                                            registration = reg_link.text.strip() if reg_link else reg_cell.text.strip()
+                                            
+                                            # Aircraft type détaillé - récupérer le type complet
+                                            detailed_type_cell = tds[1]
+                                            detailed_type = detailed_type_cell.text.strip() if detailed_type_cell else aircraft_type
+                                            
+                                            # Informations supplémentaires si disponibles
+                                            serial_number = tds[2].text.strip() if len(tds) > 2 else 'N/A'
+                                            age = tds[3].text.strip() if len(tds) > 3 else 'N/A'
+                                            
+                                            aircraft_details.append({
+                                                'registration': registration,
+                                                'detailed_type': detailed_type,
+                                                'serial_number': serial_number,
+                                                'age': age,
+                                            })
+                        
+                        fleet_details.append({
+                            'type': aircraft_type,
+                            'count': count,
+                            'aircraft_details': aircraft_details
+                        })
+                    except ValueError:
+                        continue
+    
+    return total_aircraft, fleet_details
+
+
+def _has_class(element, class_name):
+    return class_name in (element.get('class') or '').split()
+
+
+def _first(iterator):
+    return next(iterator, None)
+
+
+def _extract_lxml(content):
+    if not content or not content.strip():
+        return 0, []
+    root = lxml.html.fromstring(content)
+
+    total_aircraft = 0
+    total_aircraft_span = _first(span for span in root.iter('span') if _has_class(span, 'number-of-aircraft'))
+    if total_aircraft_span is not None:
+        strong_tag = _first(total_aircraft_span.iter('strong'))
+        if strong_tag is not None:
+            total_aircraft = int(strong_tag.text_content().strip())
+
+    fleet_details = []
+    aircraft_list = _first(dl for dl in root.iter('dl') if dl.get('id') == 'list-aircraft')
+    if aircraft_list is None:
+        return total_aircraft, fleet_details
+
+    for dt in aircraft_list.iter('dt'):
+        if _has_class(dt, 'header'):
+            continue
+        divs = list(dt.iter('div'))
+        if len(divs) < 2:
+            continue
+        aircraft_type = divs[0].text_content().strip()
+        try:
+            count = int(divs[1].text_content().strip())
+        except ValueError:
+            continue
+
+        aircraft_details = []
+        dd = _first(dt.itersiblings('dd'))
+        table = _first(dd.iter('table')) if dd is not None else None
+        tbody = _first(table.iter('tbody')) if table is not None else None
+        if tbody is not None:
+            for row in tbody.iter('tr'):
+                tds = list(row.iter('td'))
+                if len(tds) < 2:
+                    continue
+                reg_cell = tds[0]
+                reg_link = _first(a for a in reg_cell.iter('a') if _has_class(a, 'regLinks'))
+                registration = (reg_link if reg_link is not None else reg_cell).text_content().strip()
+                aircraft_details.append({
+                    'registration': registration,
+                    'detailed_type': tds[1].text_content().strip(),
+                    'serial_number': tds[2].text_content().strip() if len(tds) > 2 else 'N/A',
+                    'age': tds[3].text_content().strip() if len(tds) > 3 else 'N/A',
+                })
+
+        fleet_details.append({
+            'type': aircraft_type,
+            'count': count,
+            'aircraft_details': aircraft_details
+        })
+
+    return total_aircraft, fleet_details
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modèle compact des résultats de scraping de flotte
+
+Les résultats circulent dans le scraper sous forme d'objets à __slots__
+(AirlineResult -> FleetGroup -> Aircraft) au lieu de dicts imbriqués : pas de
+clés répétées pour chaque aircraft, et les chaînes très répétées (types
+d'aircraft, statuts) sont internées. La conversion vers la forme JSON
+historique est sans perte : AirlineResult.from_dict(d).to_dict() == d.
+"""
+
+import sys
+from dataclasses import dataclass, field
+
+# Valeurs considérées comme absentes dans les tableaux de flotte
+MISSING_VALUES = ('', '-', 'N/A')
+
+
+def is_missing(value):
+    return value is None or str(value).strip() in MISSING_VALUES
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(slots=True)
+class Aircraft:
+    """Un aircraft d'une flotte ; les champs à None sont absents de la forme JSON"""
+    registration: str
+    detailed_type: str
+    serial_number: str = None
+    age: str = None
+    # Champs supplémentaires (enrichissement, anciens formats), rarement présents
+    extra: dict = None
+
+    KEYS = ('registration', 'detailed_type', 'serial_number', 'age')
+
+    @classmethod
+    def from_dict(cls, data):
+        extra = {key: value for key, value in data.items() if key not in cls.KEYS} or None
+        return cls(data.get('registration'), _intern(data.get('detailed_type')),
+                   data.get('serial_number'), _intern(data.get('age')), extra)
+
+    def to_dict(self):
+        data = {'registration': self.registration, 'detailed_type': self.detailed_type}
+        if self.serial_number is not None:
+            data['serial_number'] = self.serial_number
+        if self.age is not None:
+            data['age'] = self.age
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def get(self, name):
+        if name in self.KEYS:
+            return getattr(self, name)
+        return self.extra.get(name) if self.extra else None
+
+    def set(self, name, value):
+        if name in self.KEYS:
+            setattr(self, name, _intern(value) if name != 'registration' else value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[name] = value
+
+
+@dataclass(slots=True)
+class FleetGroup:
+    """Un type d'aircraft de la flotte et ses aircraft individuels"""
+    type: str
+    count: int
+    aircraft: list = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(_intern(data['type']), data['count'],
+                   [Aircraft.from_dict(detail) for detail in data.get('aircraft_details', [])])
+
+    def to_dict(self):
+        return {
+            'type': self.type,
+            'count': self.count,
+            'aircraft_details': [aircraft.to_dict() for aircraft in self.aircraft]
+        }
+
+
+@dataclass(slots=True)
+class AirlineResult:
+    """Résultat du scraping d'une compagnie"""
+    code: str
+    name: str
+    status: str
+    total_aircraft: int = 0
+    fleet: list = field(default_factory=list)
+    error: str = None
+    original_sigle: str = None
+    original_aircraft_info: str = None
+    scraped_at: str = None
+    extra: dict = None
+
+    KEYS = ('code', 'name', 'total_aircraft', 'fleet_details', 'status', 'error',
+            'original_sigle', 'original_aircraft_info', 'scraped_at')
+
+    @classmethod
+    def from_dict(cls, data):
+        extra = {key: value for key, value in data.items() if key not in cls.KEYS} or None
+        return cls(
+            code=data['code'],
+            name=data['name'],
+            status=_intern(data['status']),
+            total_aircraft=data.get('total_aircraft', 0),
+            fleet=[FleetGroup.from_dict(group) for group in data.get('fleet_details', [])],
+            error=data.get('error'),
+            original_sigle=data.get('original_sigle'),
+            original_aircraft_info=data.get('original_aircraft_info'),
+            scraped_at=data.get('scraped_at'),
+            extra=extra,
+        )
+
+    @classmethod
+    def from_parsed(cls, code, name, total_aircraft, fleet_details):
+        """Résultat 'success' à partir de la sortie de parse_fleet_html"""
+        return cls(code, name, 'success', total_aircraft,
+                   [FleetGroup.from_dict(group) for group in fleet_details])
+
+    def to_dict(self):
+        """Forme JSON historique (mêmes clés, même ordre)"""
+        data = {
+            'code': self.code,
+            'name': self.name,
+            'total_aircraft': self.total_aircraft,
+            'fleet_details': [group.to_dict() for group in self.fleet],
+            'status': self.status,
+        }
+        if self.error is not None:
+            data['error'] = self.error
+        for key in ('original_sigle', 'original_aircraft_info', 'scraped_at'):
+            value = getattr(self, key)
+            if value is not None:
+                data[key] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    @property
+    def ok(self):
+        return self.status == 'success'
+
+    def iter_aircraft(self):
+        for group in self.fleet:
+            yield from group.aircraft
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Écriture en flux des résultats de flotte (CSV détaillé, JSON, JSONL), gzip optionnel
+
+Chaque compagnie est écrite dès qu'elle est terminée : la mémoire utilisée ne
+dépend pas du nombre de compagnies scrapées. La version Parquet du CSV
+détaillé (lue en priorité par columnar.read_table) est écrite par lots.
+"""
+
+import csv
+import gzip
+import json
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+CSV_COLUMNS = [
+    'airline_code', 'airline_name', 'sigle', 'aircraft_type', 'registration',
+    'detailed_aircraft_type', 'serial_number', 'age', 'total_fleet_size', 'status',
+]
+
+
+# Valeurs lues comme manquantes par pd.read_csv, gardées nulles dans le Parquet
+NA_VALUES = frozenset(['', 'N/A'])
+PARQUET_SCHEMA = pa.schema([(column, pa.int64() if column == 'total_fleet_size' else pa.string())
+                            for column in CSV_COLUMNS]) if pa is not None else None
+
+
+def open_text(path, append=False):
+    """Ouvre un fichier texte, compressé en gzip si le chemin se termine par .gz"""
+    mode = 'a' if append else 'w'
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8', newline='')
+    return open(path, mode, encoding='utf-8', newline='')
+
+
+def _or_na(value):
+    return 'N/A' if value is None else value
+
+
+def flatten_airline(airline):
+    """Lignes du CSV détaillé pour une compagnie (une par registration)"""
+    base = {
+        'airline_code': airline.code,
+        'airline_name': airline.name,
+        'sigle': airline.original_sigle,
+        'total_fleet_size': airline.total_aircraft,
+        'status': airline.status,
+    }
+    if not airline.fleet:
+        # Compagnie sans détails de flotte
+        yield dict(base, aircraft_type='N/A', registration='N/A', detailed_aircraft_type='N/A',
+                   serial_number='N/A', age='N/A')
+        return
+    for group in airline.fleet:
+        # Si on a des détails individuels d'aircraft
+        if group.aircraft:
+            for aircraft in group.aircraft:
+                yield dict(base, aircraft_type=group.type, registration=aircraft.registration,
+                           detailed_aircraft_type=aircraft.detailed_type,
+                           serial_number=_or_na(aircraft.serial_number), age=_or_na(aircraft.age))
+        else:
+            # Fallback pour les anciens formats
+            yield dict(base, aircraft_type=group.type, registration='N/A',
+                       detailed_aircraft_type=group.type, serial_number='N/A', age='N/A')
+
+
+class FleetCSVWriter:
+    """CSV détaillé (une ligne par registration) écrit compagnie par compagnie"""
+
+    def __init__(self, path, append=False):
+        self.path = path
+        has_content = append and os.path.exists(path) and os.path.getsize(path) > 0
+        self.file = open_text(path, append=has_content)
+        self.writer = csv.DictWriter(self.file, fieldnames=CSV_COLUMNS, lineterminator='\n')
+        if not has_content:
+            self.writer.writeheader()
+        self.rows = 0
+
+    def write_airline(self, airline):
+        rows = list(flatten_airline(airline))
+        self.writer.writerows(rows)
+        self.rows += len(rows)
+        return rows
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JSONLWriter:
+    """Un enregistrement JSON par ligne (une compagnie par ligne)"""
+
+    def __init__(self, path, append=False):
+        self.path = path
+        self.file = open_text(path, append=append)
+
+    def write(self, airline):
+        self.file.write(json.dumps(airline.to_dict(), ensure_ascii=False))
+        self.file.write('\n')
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JSONArrayWriter:
+    """Tableau JSON indenté écrit élément par élément.
+
+    Produit le même texte que json.dump(results, f, indent=2, ensure_ascii=False)
+    sans avoir besoin de la liste complète en mémoire.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open_text(path)
+        self.count = 0
+
+    def write(self, airline):
+        text = json.dumps(airline.to_dict(), indent=2, ensure_ascii=False)
+        self.file.write('[\n  ' if self.count == 0 else ',\n  ')
+        self.file.write(text.replace('\n', '\n  '))
+        self.count += 1
+
+    def close(self):
+        self.file.write('\n]' if self.count else '[]')
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def parquet_path(csv_path):
+    """Parquet jumeau d'un CSV (fleet.csv(.gz) -> fleet.parquet), comme columnar.parquet_path"""
+    root, ext = os.path.splitext(csv_path)
+    if ext == '.gz':
+        root = os.path.splitext(root)[0]
+    return root + '.parquet'
+
+
+class FleetParquetWriter:
+    """Version Parquet du CSV détaillé, alimentée avec les lignes de FleetCSVWriter.
+
+    Les lignes sont écrites par lots de `batch_rows` : la mémoire ne dépend pas
+    du nombre de compagnies. Le fichier est écrit sous un nom temporaire et
+    n'apparaît qu'une fois complet (un export interrompu ne laisse pas un
+    Parquet partiel plus récent que le CSV). Sans pyarrow, rien n'est écrit.
+    """
+
+    def __init__(self, path, batch_rows=50000):
+        self.path = path
+        self.tmp_path = path + '.tmp'
+        self.batch_rows = batch_rows
+        self.batch = []
+        self.rows = 0
+        self.writer = None
+        if pa is None:
+            print("[PARQUET] pyarrow non installé, pas de version Parquet (pip install pyarrow)")
+        else:
+            # Colonnes texte répétées (compagnie, sigle, type...) encodées en dictionnaire
+            self.writer = pq.ParquetWriter(self.tmp_path, PARQUET_SCHEMA, compression='zstd', use_dictionary=True)
+
+    def write_rows(self, rows):
+        if self.writer is None:
+            return
+        self.batch.extend(rows)
+        if len(self.batch) >= self.batch_rows:
+            self._write_batch()
+
+    def _write_batch(self):
+        columns = {}
+        for column in CSV_COLUMNS:
+            values = [row.get(column) for row in self.batch]
+            if column != 'total_fleet_size':
+                values = [None if value is None or str(value) in NA_VALUES else str(value) for value in values]
+            columns[column] = values
+        self.writer.write_table(pa.table(columns, schema=PARQUET_SCHEMA))
+        self.rows += len(self.batch)
+        self.batch = []
+
+    def close(self, complete=True):
+        if self.writer is None:
+            return
+        if complete and self.batch:
+            self._write_batch()
+        self.writer.close()
+        self.writer = None
+        if complete:
+            os.replace(self.tmp_path, self.path)
+        else:
+            os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        self.close(complete=exc_type is None)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache HTTP persistant (SQLite) avec revalidation conditionnelle ETag / Last-Modified
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+
+class HTTPCache:
+    """Cache des pages de flotte, indexé par URL.
+
+    Chaque entrée conserve le corps compressé, les en-têtes ETag/Last-Modified
+    et le résultat déjà parsé : sur une réponse 304 la page n'est ni
+    retéléchargée ni reparsée. Les entrées plus vieilles que `max_age_days`
+    sont supprimées, puis les moins récemment utilisées tant que le cache
+    dépasse `max_bytes`. Le budget est aussi tenu pendant le run : quand la
+    taille suivie dépasse `max_bytes`, le cache redescend à `EVICT_TARGET`
+    (une fraction du budget, pour ne pas évincer à chaque écriture).
+    """
+
+    EVICT_TARGET = 0.9
+
+    def __init__(self, db_path, max_bytes=200 * 1024 * 1024, max_age_days=30):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+        # Chaque recherche compte : hit = page revalidée (304), miss = tout le reste
+        # (pas d'entrée, page modifiée, requête en échec)
+        self.lookups = 0
+        self.hits = 0
+        self.evictions = 0
+        # Taille des corps en cache, recalculée à chaque éviction
+        self.size = 0
+        # Partagé avec les threads de parsing du scraper asynchrone : accès sérialisés par self.lock
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB NOT NULL,
+                parsed TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+        self.evict()
+
+    def lookup(self, url):
+        """Renvoie l'entrée en cache pour cette URL, ou None"""
+        with self.lock:
+            self.lookups += 1
+            row = self.conn.execute(
+                "SELECT etag, last_modified, parsed FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            etag, last_modified, parsed = row
+            return {'etag': etag, 'last_modified': last_modified, 'parsed': parsed}
+
+    @staticmethod
+    def conditional_headers(entry):
+        """En-têtes If-None-Match / If-Modified-Since pour revalider une entrée"""
+        headers = {}
+        if entry:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def revalidated(self, url, entry):
+        """Réponse 304 : renvoie le résultat parsé en cache"""
+        with self.lock:
+            self.hits += 1
+            self.conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            self.conn.commit()
+            return json.loads(entry['parsed'])
+
+    def store(self, url, headers, body, parsed):
+        """Enregistre une réponse 200 et son résultat parsé"""
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            # Sans validateur, la page ne pourra jamais être revalidée
+            return
+        # Compression et sérialisation hors verrou
+        compressed = zlib.compress(body)
+        parsed = json.dumps(parsed, ensure_ascii=False)
+        with self.lock:
+            now = time.time()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (url, etag, last_modified, body, parsed, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, compressed, parsed, len(compressed), now, now),
+            )
+            self.conn.commit()
+            # Surestimée si l'URL était déjà en cache : l'éviction recalcule la taille exacte
+            self.size += len(compressed)
+            over_budget = self.size > self.max_bytes
+        if over_budget:
+            self.evict(int(self.max_bytes * self.EVICT_TARGET))
+
+    @property
+    def misses(self):
+        return self.lookups - self.hits
+
+    def evict(self, target=None):
+        """Supprime les entrées expirées puis les moins récemment utilisées au-delà de target (max_bytes)"""
+        target = self.max_bytes if target is None else target
+        with self.lock:
+            cursor = self.conn.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - self.max_age,))
+            self.evictions += cursor.rowcount
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > target:
+                to_delete = []
+                for url, size in self.conn.execute("SELECT url, size FROM responses ORDER BY accessed_at"):
+                    if total <= target:
+                        break
+                    to_delete.append((url,))
+                    total -= size
+                self.conn.executemany("DELETE FROM responses WHERE url = ?", to_delete)
+                self.evictions += len(to_delete)
+            self.conn.commit()
+            self.size = total
+
+    def stats(self):
+        with self.lock:
+            entries, size = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / self.lookups if self.lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': entries,
+                'size_bytes': size,
+            }
+
+    def print_stats(self):
+        stats = self.stats()
+        print(f"[CACHE] {stats['hits']} hits (304), {stats['misses']} misses, "
+              f"taux de hit {stats['hit_rate']:.1%}, {stats['entries']} entrées, "
+              f"{stats['size_bytes'] / 1024 / 1024:.1f} Mo, {stats['evictions']} évictions")
+
+    def close(self):
+        self.evict()
+        self.conn.close()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File de jobs de scraping exécutés en arrière-plan (sous-processus)
+
+Les jobs sont lancés un par un dans l'ordre d'ajout. La sortie de chaque
+sous-processus est lue ligne par ligne par un thread dédié : les événements
+"[PROGRESS]" (voir progress.py) sont complétés du débit et de l'ETA, et tous
+les événements sont déposés dans une queue.Queue que l'interface Tk vide
+depuis son propre thread (poll).
+"""
+
+import itertools
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+
+from progress import parse_progress
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PENDING, RUNNING, DONE, FAILED, CANCELLED = 'en attente', 'en cours', 'terminé', 'échec', 'annulé'
+
+
+class Job:
+    _ids = itertools.count(1)
+
+    def __init__(self, name, argv):
+        self.id = next(self._ids)
+        self.name = name
+        self.argv = argv
+        self.state = PENDING
+        self.process = None
+        self.cancelled = False
+        self.started_at = None
+        self.progress = None
+        self.returncode = None
+
+    def __str__(self):
+        text = f"#{self.id} {self.name} — {self.state}"
+        if self.progress and self.state == RUNNING:
+            text += f" ({self.progress['done']}/{self.progress['total']})"
+        return text
+
+
+def linkedin_job(min_fleet, max_fleet, start, end, nb_requetes, roles):
+    """Job LinkedIn avec les mêmes arguments que ceux de linkedin_scraper.py"""
+    argv = [sys.executable, os.path.join(SCRIPTS_DIR, 'linkedin_scraper.py'),
+            str(min_fleet), str(max_fleet), str(start), str(end), str(nb_requetes), roles]
+    return f"LinkedIn {roles} [{start}:{end}]", argv
+
+
+def flightradar_job(choice, use_async=False, resume=False):
+    """Job FlightRadar24 (choix 1 : 10 compagnies, 2 : 50, 3 : toutes)"""
+    argv = [sys.executable, os.path.join(SCRIPTS_DIR, 'scraper_flightradar24.py'), str(choice)]
+    if use_async:
+        argv.append('--async')
+    if resume:
+        argv.append('--resume')
+    return f"FlightRadar24 choix {choice}{' async' if use_async else ''}", argv
+
+
+class JobRunner:
+    """Exécute les jobs en file, un à la fois, et publie leurs événements.
+
+    Événements (type, job, données) : 'state' (nouvel état) à chaque changement,
+    'progress' (done, total, errors, throughput, eta...) et 'log' (ligne brute).
+    """
+
+    def __init__(self):
+        self.events = queue.Queue()
+        self.jobs = []
+        self.pending = deque()
+        self.current = None
+        self.condition = threading.Condition()
+        self.closed = False
+        self.thread = threading.Thread(target=self._run_loop, daemon=True)
+        self.thread.start()
+
+    def submit(self, name, argv):
+        job = Job(name, argv)
+        with self.condition:
+            self.jobs.append(job)
+            self.pending.append(job)
+            self.condition.notify()
+        self.events.put(('state', job, job.state))
+        return job
+
+    def cancel(self, job):
+        """Retire un job de la file, ou arrête le sous-processus s'il est en cours"""
+        with self.condition:
+            if job in self.pending:
+                self.pending.remove(job)
+                job.state = CANCELLED
+                self.events.put(('state', job, job.state))
+                return
+            if job is self.current and job.process and job.process.poll() is None:
+                job.cancelled = True
+                job.process.terminate()
+
+    def poll(self):
+        """Événements en attente (non bloquant, à appeler depuis le thread Tk)"""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def shutdown(self):
+        with self.condition:
+            self.closed = True
+            for job in list(self.pending):
+                self.pending.remove(job)
+                job.state = CANCELLED
+            self.condition.notify()
+        if self.current:
+            self.cancel(self.current)
+
+    def _run_loop(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                if self.closed:
+                    return
+                job = self.current = self.pending.popleft()
+            self._run(job)
+            with self.condition:
+                self.current = None
+
+    def _run(self, job):
+        env = dict(os.environ, SCRAPER_PROGRESS_EVENTS='1', PYTHONUNBUFFERED='1', PYTHONIOENCODING='utf-8')
+        job.started_at = time.monotonic()
+        try:
+            job.process = subprocess.Popen(job.argv, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                           stdin=subprocess.DEVNULL, text=True, encoding='utf-8',
+                                           errors='replace', bufsize=1, env=env, cwd=SCRIPTS_DIR)
+        except OSError as e:
+            job.state = FAILED
+            self.events.put(('log', job, f"Impossible de lancer le job : {e}"))
+            self.events.put(('state', job, job.state))
+            return
+        job.state = RUNNING
+        self.events.put(('state', job, job.state))
+
+        for line in job.process.stdout:
+            line = line.rstrip('\n')
+            event = parse_progress(line)
+            if event is None:
+                self.events.put(('log', job, line))
+                continue
+            elapsed = time.monotonic() - job.started_at
+            throughput = event['done'] / elapsed if elapsed > 0 else 0.0
+            event['throughput'] = throughput
+            event['eta'] = (event['total'] - event['done']) / throughput if throughput > 0 else None
+            job.progress = event
+            self.events.put(('progress', job, event))
+
+        job.returncode = job.process.wait()
+        if job.cancelled:
+            job.state = CANCELLED
+        else:
+            job.state = DONE if job.returncode == 0 else FAILED
+        self.events.put(('state', job, job.state))
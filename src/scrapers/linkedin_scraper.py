@@ -1,3 +1,16 @@
+"""
+Recherche de profils LinkedIn (Google Custom Search) pour une tranche de compagnies
+
+Usage (mêmes arguments que ceux passés par main.py) :
+    python src/scrapers/linkedin_scraper.py MIN_FLEET MAX_FLEET START END NB_REQUETES "Rôle 1, Rôle 2"
+    python src/scrapers/linkedin_scraper.py --resume
+
+Plusieurs rôles peuvent être cherchés en une seule requête par compagnie : la
+requête combine les intitulés de tous les rôles et chaque profil trouvé est
+attribué au rôle dont il contient l'intitulé.
+"""
+
+import argparse
 import csv
 import os
 import pandas as pd
@@ -5,84 +18,79 @@ import random
 from googleapiclient.discovery import build
 from dotenv import load_dotenv
 
+from search_cache import SearchCache, normalize_company
+from search_executor import DailyQuota, SearchExecutor, load_pending, save_pending
+
 load_dotenv()
 API_KEY = os.getenv("GOOGLE_API_KEY")
 SEARCH_ENGINE_ID = os.getenv("GOOGLE_SEARCH_ENGINE_ID")
 
-
-# Rôle à rechercher
-role = "operation director"  # À ajuster selon besoin
-
-# Initialiser le client Custom Search API
-service = build("customsearch", "v1", developerKey=API_KEY)
+# Quota Custom Search : 100 requêtes/jour en gratuit, à ajuster selon l'abonnement
+DAILY_QUOTA = int(os.getenv("GOOGLE_CSE_DAILY_QUOTA", "100"))
+QUERIES_PER_SECOND = float(os.getenv("GOOGLE_CSE_QPS", "1"))
+SEARCH_WORKERS = 4
+# Durée de validité des réponses en cache
+CACHE_MAX_AGE_DAYS = int(os.getenv("LINKEDIN_CACHE_MAX_AGE_DAYS", "30"))
+
+DEFAULT_ROLES = ["operation director"]
+# Variantes d'intitulé connues ; un rôle absent de la table est cherché tel quel
+ROLE_SYNONYMS = {
+    'operation director': ["operation director", "operations director", "director of operations"],
+    'crew planner': ["crew planner", "crew planning"],
+}
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+COMPANIES_CSV = os.path.join(BASE_DIR, 'data', 'raw', 'airlines_fleet_leq_25.csv')
+FLEET_SIZE_CSV = os.path.join(BASE_DIR, 'data', 'processed', 'fleet_size_by_company.csv')
+EXPORT_DIR = os.path.join(BASE_DIR, 'data', 'exports')
+CACHE_DIR = os.path.join(BASE_DIR, 'data', 'cache')
+
+COLUMNS = [
+    'Name', 'LinkedIn Pero', 'Desc', 'Location', 'LinkedIn Airline', 'WebSite', 'Mail Pro',
+    'Role', 'Activity', 'Hiring', 'Latest LinkedIn Update', 'More'
+]
 
 
-# Lire la liste des entreprises depuis le CSV (colonne 'companies_name', ignorer l'en-tête)
+def role_terms(role):
+    return ROLE_SYNONYMS.get(role.strip().lower(), [role.strip().lower()])
 
-# Choix du nombre de requêtes à lancer :
-print("Combien de requêtes voulez-vous lancer ?")
-print("1: Une seule\n5: Cinq\n10: Dix\n50: Cinquante (lignes 800 à 850)\n100: Cent\n0: Toutes")
-try:
-    choix = int(input("Votre choix (1/5/10/0): ").strip())
-except Exception:
-    choix = 0
 
+def query_template(roles):
+    """Modèle de requête combinant les intitulés de tous les rôles ({company} à remplacer)"""
+    terms = [term for role in roles for term in role_terms(role)]
+    return ' {company} (' + ' OR '.join(f'"{term}"' for term in dict.fromkeys(terms)) + ') site:linkedin.com/in'
 
 
-# Index de début et de fin pour la tranche de lignes à traiter
-start_line = 699
-end_line = 749
+def build_query(company, template):
+    return template.format(company=company)
 
-companies = []
-base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-csv_path = os.path.join(base_dir, 'data', 'raw', 'airlines_fleet_leq_25.csv')
-with open(csv_path, newline='', encoding='utf-8') as csvfile:
-    reader = list(csv.reader(csvfile))
-    # Sauter l'en-tête
-    reader = reader[1:]
-    # Prendre la tranche paramétrable
-    for row in reader[start_line:end_line]:
-        if row and row[0].strip():
-            companies.append(row[0].strip())
 
+def search(service, query, num=3):
+    return service.cse().list(q=query, cx=SEARCH_ENGINE_ID, num=num).execute()
 
-if choix in [1, 5, 10]:
-    companies = random.sample(companies, k=choix)
-elif choix == 50:
-    # Recharger la tranche paramétrable
-    companies = []
-    with open(csv_path, newline='', encoding='utf-8') as csvfile:
-        reader = list(csv.reader(csvfile))[1:]
-        for row in reader[start_line:end_line]:
-            if row and row[0].strip():
-                companies.append(row[0].strip())
-elif choix == 100:
-    companies = companies[-100:]
-# 0 ou autre = toutes
 
-# Stockage des résultats
-results_data = []
+def assign_profiles(items, roles):
+    """Premier profil LinkedIn correspondant à chaque rôle, dans un même jeu de résultats"""
+    profiles = [item for item in items or [] if 'linkedin.com/in/' in item.get('link', '')]
+    assigned = {}
+    for role in roles:
+        terms = role_terms(role)
+        for item in profiles:
+            text = f"{item.get('title', '')} {item.get('snippet', '')}".lower()
+            if any(term in text for term in terms):
+                assigned[role] = item
+                break
+    if len(roles) == 1 and not assigned and profiles:
+        # Un seul rôle : comme avant, le premier profil trouvé est retenu
+        assigned[roles[0]] = profiles[0]
+    return assigned
 
 
-for idx, company in enumerate(companies, 1):
-    query = f' {company} ("operation director" OR "operations director" OR "director of operations") site:linkedin.com/in'
-    try:
-        res = service.cse().list(q=query, cx=SEARCH_ENGINE_ID, num=3).execute()
-        name, linkedin_pero = '', ''
-        if 'items' in res:
-            for item in res['items']:
-                lnk = item.get('link', '')
-                if 'linkedin.com/in/' in lnk:
-                    name = item.get('title', '')
-                    linkedin_pero = lnk
-                    break
-    except Exception as e:
-        print(f"Erreur pour {company}: {e}")
-        name, linkedin_pero = '', ''
-    results_data.append({
-        'Name': name,
+def result_row(company, item, role):
+    return {
+        'Name': item.get('title', '') if item else '',
         'Company': company,
-        'LinkedIn Pero': linkedin_pero,
+        'LinkedIn Pero': item.get('link', '') if item else '',
         'Desc': '',
         'Location': '',
         'LinkedIn Airline': '',
@@ -93,19 +101,143 @@ for idx, company in enumerate(companies, 1):
         'Hiring': '',
         'Latest LinkedIn Update': '',
         'More': ''
-    })
-    if idx % 10 == 0 or idx == len(companies):
-        print(f"Progression: {idx}/{len(companies)} compagnies traitées.")
-
-# Sauvegarder les résultats dans un CSV dans le dossier exports
-export_dir = os.path.join(base_dir, 'data', 'exports')
-os.makedirs(export_dir, exist_ok=True)
-export_path = os.path.join(export_dir, 'results.csv')
-columns = [
-    'Name', 'LinkedIn Pero', 'Desc', 'Location', 'LinkedIn Airline', 'WebSite', 'Mail Pro',
-    'Role', 'Activity', 'Hiring', 'Latest LinkedIn Update', 'More'
-]
-df = pd.DataFrame(results_data, columns=columns)
-df.to_csv(export_path, index=False, encoding='utf-8')
+    }
+
 
-print(f"Extraction terminée. Résultats dans '{export_path}'")
+def load_fleet_sizes(path=FLEET_SIZE_CSV):
+    """Taille de flotte par nom de compagnie normalisé"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, newline='', encoding='utf-8') as f:
+        return {row['airline_name_norm']: int(row['fleet_size']) for row in csv.DictReader(f)}
+
+
+def select_companies(csv_path=COMPANIES_CSV, start_index=0, end_index=None, nb_requetes=0,
+                     min_fleet_size=None, max_fleet_size=None):
+    """Compagnies de la tranche [start_index:end_index], filtrées par taille de flotte.
+
+    nb_requetes = 0 : toute la tranche ; sinon un échantillon aléatoire de cette taille.
+    Les compagnies dont la taille de flotte est inconnue sont conservées.
+    """
+    with open(csv_path, newline='', encoding='utf-8') as csvfile:
+        # Sauter l'en-tête
+        rows = list(csv.reader(csvfile))[1:]
+    companies = [row[0].strip() for row in rows[start_index:end_index] if row and row[0].strip()]
+
+    if min_fleet_size is not None or max_fleet_size is not None:
+        fleet_sizes = load_fleet_sizes()
+        low = min_fleet_size if min_fleet_size is not None else 0
+        high = max_fleet_size if max_fleet_size is not None else float('inf')
+        companies = [company for company in companies
+                     if fleet_sizes.get(normalize_company(company)) is None
+                     or low <= fleet_sizes[normalize_company(company)] <= high]
+
+    # Une seule requête par compagnie, même si elle apparaît plusieurs fois
+    companies = list(dict.fromkeys(companies))
+    if 0 < nb_requetes < len(companies):
+        companies = random.sample(companies, k=nb_requetes)
+    return companies
+
+
+def scrape_linkedin(roles=None, min_fleet_size=None, max_fleet_size=None, start_index=0, end_index=None,
+                    nb_requetes=0, resume=False, export_path=None):
+    """Cherche les profils des rôles demandés pour chaque compagnie et exporte les résultats en CSV.
+
+    Une seule requête Custom Search par compagnie, quel que soit le nombre de
+    rôles. Renvoie les lignes exportées.
+    """
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    export_path = export_path or os.path.join(EXPORT_DIR, 'results.csv')
+    # Requêtes non exécutées au run précédent (quota épuisé)
+    pending_path = os.path.join(EXPORT_DIR, 'linkedin_pending.json')
+
+    if resume:
+        pending = load_pending(pending_path)
+        if not pending:
+            print("Aucune requête restante à reprendre.")
+            return []
+        roles = pending['roles']
+        template = query_template(roles)
+        items = pending['remaining']
+    else:
+        roles = roles or DEFAULT_ROLES
+        template = query_template(roles)
+        companies = select_companies(start_index=start_index, end_index=end_index, nb_requetes=nb_requetes,
+                                     min_fleet_size=min_fleet_size, max_fleet_size=max_fleet_size)
+        items = [(company, build_query(company, template)) for company in companies]
+    print(f"{len(items)} compagnies, rôles : {', '.join(roles)}")
+
+    # Réponses déjà en cache (même compagnie, même modèle de requête) : pas d'appel à l'API
+    cache = SearchCache(os.path.join(CACHE_DIR, 'linkedin_search_cache.sqlite'), max_age_days=CACHE_MAX_AGE_DAYS)
+    responses = {}
+    misses = []
+    for company, query in items:
+        cached = cache.lookup(company, template)
+        if cached is not None:
+            responses[company] = cached
+        else:
+            misses.append((company, query))
+
+    # Requêtes manquantes en parallèle, dans les limites du quota Custom Search ;
+    # avec plusieurs rôles on demande 10 résultats (même coût qu'une requête à 3)
+    num = 3 if len(roles) == 1 else 10
+    quota = DailyQuota(os.path.join(EXPORT_DIR, 'cse_quota.json'), per_day=DAILY_QUOTA)
+    executor = SearchExecutor(lambda: build("customsearch", "v1", developerKey=API_KEY),
+                              lambda service, query: search(service, query, num), quota,
+                              per_second=QUERIES_PER_SECOND, workers=SEARCH_WORKERS)
+    queries = dict(misses)
+    try:
+        fetched, errors, remaining = executor.run(
+            misses, on_result=lambda company, response: cache.store(company, template, queries[company], response))
+        responses.update(fetched)
+        cache.print_stats()
+    finally:
+        cache.close()
+    for company, error in errors.items():
+        print(f"Erreur pour {company}: {error}")
+    save_pending(pending_path, remaining, roles=roles)
+
+    # Une ligne par compagnie et par rôle (les requêtes restantes seront faites à la reprise)
+    results_data = []
+    for company, _ in items:
+        if company not in responses and company not in errors:
+            continue
+        assigned = assign_profiles(responses.get(company, {}).get('items'), roles)
+        results_data.extend(result_row(company, assigned.get(role), role) for role in roles)
+
+    # Sauvegarder les résultats dans un CSV dans le dossier exports
+    df = pd.DataFrame(results_data, columns=COLUMNS)
+    if resume and os.path.exists(export_path):
+        # Reprise : on complète les résultats du run précédent
+        df.to_csv(export_path, mode='a', header=False, index=False, encoding='utf-8')
+    else:
+        df.to_csv(export_path, index=False, encoding='utf-8')
+
+    print(f"Extraction terminée. Résultats dans '{export_path}'")
+    return results_data
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Recherche LinkedIn (Google Custom Search) par compagnie et rôle")
+    parser.add_argument('min_fleet_size', nargs='?', type=int, default=None)
+    parser.add_argument('max_fleet_size', nargs='?', type=int, default=None)
+    parser.add_argument('start_index', nargs='?', type=int, default=0)
+    parser.add_argument('end_index', nargs='?', type=int, default=None)
+    parser.add_argument('nb_requetes', nargs='?', type=int, default=0,
+                        help="0 : toute la tranche, sinon échantillon aléatoire de cette taille")
+    parser.add_argument('roles', nargs='?', default=None, help="Un ou plusieurs rôles séparés par des virgules")
+    parser.add_argument('--resume', action='store_true',
+                        help="Reprend les requêtes restantes du run précédent (quota épuisé)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    roles = [role.strip() for role in args.roles.split(',') if role.strip()] if args.roles else None
+    scrape_linkedin(roles, args.min_fleet_size, args.max_fleet_size, args.start_index, args.end_index,
+                    args.nb_requetes, resume=args.resume)
+
+
+if __name__ == '__main__':
+    main()
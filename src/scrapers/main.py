@@ -1,16 +1,28 @@
 
 import tkinter as tk
 from tkinter import ttk, messagebox
-import subprocess
-import sys
-import os
+
+from job_runner import JobRunner, linkedin_job, flightradar_job, RUNNING, DONE, FAILED, CANCELLED
+
+
+def format_duration(seconds):
+    if seconds is None:
+        return "--:--"
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:d}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
+
 
 class ScraperApp(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("LinkedIn Airline Scraper")
-        self.geometry("400x400")
+        self.geometry("560x760")
+        # Les jobs tournent en sous-processus : l'interface reste réactive
+        self.runner = JobRunner()
         self.create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.after(100, self.poll_jobs)
 
     def create_widgets(self):
         # Fleet size
@@ -37,13 +49,35 @@ class ScraperApp(tk.Tk):
         ttk.Entry(self, textvariable=self.nb_requetes).pack()
 
         # Rôle
-        ttk.Label(self, text="Rôle à rechercher:").pack(pady=5)
+        ttk.Label(self, text="Rôle(s) à rechercher (séparés par des virgules):").pack(pady=5)
         self.role = tk.StringVar(value="Crew Planner")
         ttk.Entry(self, textvariable=self.role).pack()
 
         # Bouton lancer
-        ttk.Button(self, text="Lancer le scraping", command=self.launch_scraping).pack(pady=20)
+        ttk.Button(self, text="Lancer le scraping", command=self.launch_scraping).pack(pady=10)
+
+        # Scraping des flottes FlightRadar24
+        fr24 = ttk.Frame(self)
+        fr24.pack(pady=5)
+        ttk.Label(fr24, text="FlightRadar24 (1 : 10, 2 : 50, 3 : toutes) :").pack(side=tk.LEFT)
+        self.fr24_choice = tk.StringVar(value="1")
+        ttk.Combobox(fr24, textvariable=self.fr24_choice, values=["1", "2", "3"], width=3,
+                     state="readonly").pack(side=tk.LEFT, padx=5)
+        self.fr24_async = tk.BooleanVar(value=False)
+        ttk.Checkbutton(fr24, text="async", variable=self.fr24_async).pack(side=tk.LEFT)
+        ttk.Button(self, text="Lancer FlightRadar24", command=self.launch_flightradar).pack(pady=5)
 
+        # File des jobs et progression
+        ttk.Label(self, text="Jobs :").pack(pady=(10, 0))
+        self.jobs_list = tk.Listbox(self, height=6, width=70)
+        self.jobs_list.pack(padx=10)
+        self.progress = ttk.Progressbar(self, orient=tk.HORIZONTAL, length=500, mode='determinate')
+        self.progress.pack(pady=5)
+        self.status = tk.StringVar(value="Aucun job en cours")
+        ttk.Label(self, textvariable=self.status).pack()
+        self.last_log = tk.StringVar(value="")
+        ttk.Label(self, textvariable=self.last_log, wraplength=520, foreground="gray").pack(pady=5)
+        ttk.Button(self, text="Annuler le job sélectionné", command=self.cancel_job).pack(pady=5)
 
     def launch_scraping(self):
         # Récupérer les valeurs
@@ -55,22 +89,68 @@ class ScraperApp(tk.Tk):
             'nb_requetes': self.nb_requetes.get(),
             'role': self.role.get(),
         }
-        # messagebox.showinfo("Paramètres", f"Lancement avec :\n{params}")
-
-        # Appeler le script linkedin_scraper.py avec les paramètres en arguments
-        script_path = os.path.join(os.path.dirname(__file__), 'linkedin_scraper.py')
-        cmd = [sys.executable, script_path,
-               str(params['min_fleet_size']),
-               str(params['max_fleet_size']),
-               str(params['start_index']),
-               str(params['end_index']),
-               str(params['nb_requetes']),
-               params['role']]
-        try:
-            subprocess.run(cmd, check=True)
-            messagebox.showinfo("Succès", "Scraping terminé !")
-        except subprocess.CalledProcessError as e:
-            messagebox.showerror("Erreur", f"Erreur lors du scraping : {e}")
+        # Le job linkedin_scraper.py est ajouté à la file (exécuté après les jobs déjà en attente)
+        self.runner.submit(*linkedin_job(params['min_fleet_size'], params['max_fleet_size'],
+                                         params['start_index'], params['end_index'],
+                                         params['nb_requetes'], params['role']))
+
+    def launch_flightradar(self):
+        self.runner.submit(*flightradar_job(self.fr24_choice.get(), use_async=self.fr24_async.get()))
+
+    def cancel_job(self):
+        selection = self.jobs_list.curselection()
+        if selection:
+            job = self.runner.jobs[selection[0]]
+        else:
+            # Sans sélection : le job en cours
+            job = self.runner.current
+        if job is not None:
+            self.runner.cancel(job)
+
+    def refresh_jobs(self):
+        selection = self.jobs_list.curselection()
+        self.jobs_list.delete(0, tk.END)
+        for job in self.runner.jobs:
+            self.jobs_list.insert(tk.END, str(job))
+        for index in selection:
+            self.jobs_list.selection_set(index)
+
+    def poll_jobs(self):
+        events = self.runner.poll()
+        for kind, job, data in events:
+            if kind == 'progress':
+                self.progress['maximum'] = max(data['total'], 1)
+                self.progress['value'] = data['done']
+                rate = f", {data['rate']:.2f} req/s" if data.get('rate') is not None else ""
+                self.status.set(f"{job.name} : {data['done']}/{data['total']} "
+                                f"({data['throughput']:.2f}/s{rate}) — ETA {format_duration(data['eta'])} "
+                                f"— {data.get('errors', 0)} erreurs")
+            elif kind == 'log':
+                if data.strip():
+                    self.last_log.set(data.strip())
+            elif kind == 'state':
+                # data : état au moment de l'événement (job.state a pu changer depuis)
+                if data == RUNNING:
+                    self.progress['value'] = 0
+                    self.status.set(f"{job.name} : démarrage...")
+                elif data == DONE:
+                    self.status.set(f"{job.name} : terminé")
+                elif data == FAILED:
+                    self.status.set(f"{job.name} : échec (code {job.returncode})")
+                    messagebox.showerror("Erreur", f"Erreur lors du scraping : {job.name}\n{self.last_log.get()}")
+                elif data == CANCELLED:
+                    self.status.set(f"{job.name} : annulé")
+        if events:
+            self.refresh_jobs()
+        self.after(100, self.poll_jobs)
+
+    def on_close(self):
+        running = self.runner.current
+        if running is not None and not messagebox.askyesno("Quitter", f"{running.name} est en cours. L'arrêter et quitter ?"):
+            return
+        self.runner.shutdown()
+        self.destroy()
+
 
 if __name__ == "__main__":
     app = ScraperApp()
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Événements de progression structurés, lus par le lanceur graphique (job_runner.py)
+
+Quand SCRAPER_PROGRESS_EVENTS=1, les scrapers écrivent sur stdout des lignes
+"[PROGRESS] {json}" (done, total, errors, rate...) en plus de leurs messages
+habituels.
+"""
+
+import json
+import os
+
+PROGRESS_PREFIX = '[PROGRESS] '
+ENABLED = os.getenv('SCRAPER_PROGRESS_EVENTS') == '1'
+
+
+def emit_progress(done, total, errors=0, **extra):
+    if ENABLED:
+        print(PROGRESS_PREFIX + json.dumps(dict(done=done, total=total, errors=errors, **extra)), flush=True)
+
+
+def parse_progress(line):
+    """Événement contenu dans une ligne de sortie, ou None"""
+    if not line.startswith(PROGRESS_PREFIX):
+        return None
+    try:
+        return json.loads(line[len(PROGRESS_PREFIX):])
+    except ValueError:
+        return None
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Contrôle adaptatif du débit de scraping (AIMD : additive increase, multiplicative decrease)
+"""
+
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value):
+    """Convertit un en-tête Retry-After (secondes ou date HTTP) en secondes d'attente"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AIMDRateController:
+    """Débit de requêtes partagé, ajusté selon les réponses du site.
+
+    Tant que les réponses sont 2xx/304 et rapides, le débit augmente de
+    `increase` req/s à chaque réponse. Sur 429/503, erreur réseau ou latence
+    supérieure à `latency_factor` fois la latence de référence, il est
+    multiplié par `decrease` (au plus une fois par intervalle de requête,
+    pour qu'une rafale d'échecs simultanés ne compte qu'une fois). Un en-tête
+    Retry-After bloque toutes les requêtes jusqu'à son expiration.
+
+    Les créneaux sont réservés sous verrou : le même contrôleur peut servir
+    au scraping séquentiel (wait), aux threads et aux coroutines (acquire).
+    """
+
+    def __init__(self, initial_rate=0.5, min_rate=0.05, max_rate=5.0, increase=0.02,
+                 decrease=0.5, latency_factor=2.5, latency_smoothing=0.1):
+        self.rate = min(max(initial_rate, min_rate), max_rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.latency_smoothing = latency_smoothing
+        self.baseline_latency = None
+        self.blocked_until = 0.0
+        self._next_slot = 0.0
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """Réserve le prochain créneau et renvoie le délai d'attente en secondes"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(self._next_slot, self.blocked_until, now)
+            self._next_slot = start + 1.0 / self.rate
+            return start - now
+
+    def wait(self):
+        """Attend le prochain créneau (mode séquentiel ou threads)"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire(self):
+        """Attend le prochain créneau (mode asyncio)"""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def record(self, status, latency, retry_after=None):
+        """Ajuste le débit après une réponse (status None = erreur réseau)"""
+        with self._lock:
+            now = time.monotonic()
+            wait = parse_retry_after(retry_after)
+            if wait:
+                self.blocked_until = max(self.blocked_until, now + wait)
+            if status is None or status in THROTTLE_STATUSES:
+                self._decrease(now)
+            elif status < 400:
+                if self.baseline_latency is not None and latency > self.latency_factor * self.baseline_latency:
+                    self._decrease(now)
+                else:
+                    self.rate = min(self.max_rate, self.rate + self.increase)
+                # La référence ne suit que lentement les latences observées
+                if self.baseline_latency is None:
+                    self.baseline_latency = latency
+                else:
+                    self.baseline_latency += self.latency_smoothing * (latency - self.baseline_latency)
+
+    def _decrease(self, now):
+        if now - self._last_decrease < 1.0 / self.rate:
+            return
+        self._last_decrease = now
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+
+    def set_max_rate(self, max_rate):
+        """Change le plafond de débit (budget de politesse)"""
+        with self._lock:
+            self.max_rate = max_rate
+            self.rate = min(self.rate, max_rate)
+
+    @property
+    def current_rate(self):
+        return self.rate
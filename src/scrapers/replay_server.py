@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Serveur HTTP local rejouant des pages de flotte FlightRadar24 (enregistrées ou synthétiques)
+
+Usage :
+    python src/scrapers/replay_server.py --port 8024 --latency-ms 80 --error-429 0.02 --error-5xx 0.01
+    python src/scrapers/replay_server.py --pages data/samples --catalog /tmp/catalog.csv --airlines 3000
+
+Le scraper s'y connecte en remplaçant base_url (FlightRadar24Scraper().base_url = server.url).
+"""
+
+import argparse
+import csv
+import hashlib
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bench_parser import generate_aircraft_page, generate_fleet_page
+
+FLEET_PATH = re.compile(r'^/data/airlines/([^/]+)/fleet/?$')
+AIRCRAFT_PATH = re.compile(r'^/data/aircraft/([^/]+)/?$')
+
+
+def synthetic_fleet_size(airline_code):
+    """Taille de flotte déterministe pour un code (beaucoup de petites flottes)"""
+    rng = random.Random(zlib.crc32(airline_code.encode('utf-8')))
+    return max(1, int(rng.paretovariate(1.2) * 2))
+
+
+def write_catalog(path, n_airlines):
+    """Écrit un catalogue au format data/raw/flightradar24.csv pour n compagnies synthétiques"""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+        writer.writerow(["text-center href", "smalloperatorsymbol src", "notranslate", "text-right", "text-right 2"])
+        writer.writerow(["", "", "", "", ""])
+        for i in range(n_airlines):
+            code = f"r{i:05d}"
+            writer.writerow([f"https://www.flightradar24.com/data/airlines/{code}", "", f"Replay Airline {i}",
+                             f"R{i % 10} / R{i:04d}", f"{synthetic_fleet_size(code)} aircraft"])
+    return path
+
+
+class ReplayServer:
+    """Serveur de pages de flotte avec injection de latence et d'erreurs.
+
+    Les pages enregistrées sont lues dans `pages_dir/{code}.html` ; sinon une
+    page synthétique déterministe est générée. Chaque réponse 200 porte un
+    ETag, ce qui permet aussi de tester le cache HTTP (réponses 304).
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, pages_dir=None, latency_ms=0.0, jitter_ms=0.0,
+                 error_429=0.0, error_5xx=0.0, retry_after=1, seed=0):
+        self.pages_dir = pages_dir
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.error_429 = error_429
+        self.error_5xx = error_5xx
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.status_counts = {}
+        self._pages = {}
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def page(self, airline_code):
+        if airline_code not in self._pages:
+            path = os.path.join(self.pages_dir, f"{airline_code}.html") if self.pages_dir else None
+            if path and os.path.exists(path):
+                with open(path, 'rb') as f:
+                    body = f.read()
+            else:
+                body = generate_fleet_page(airline_code, synthetic_fleet_size(airline_code))
+            self._pages[airline_code] = (body, '"%s"' % hashlib.md5(body).hexdigest())
+        return self._pages[airline_code]
+
+    def aircraft_page(self, registration):
+        key = ('aircraft', registration)
+        if key not in self._pages:
+            body = generate_aircraft_page(registration)
+            self._pages[key] = (body, '"%s"' % hashlib.md5(body).hexdigest())
+        return self._pages[key]
+
+    def draw(self):
+        """Tire la latence et l'éventuelle erreur injectée pour une requête"""
+        with self.lock:
+            self.requests += 1
+            delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+            roll = self.rng.random()
+        if roll < self.error_429:
+            return delay, 429
+        if roll < self.error_429 + self.error_5xx:
+            return delay, 503 if roll < self.error_429 + self.error_5xx / 2 else 500
+        return delay, 200
+
+    def count(self, status):
+        with self.lock:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                path = self.path.split('?')[0]
+                match = FLEET_PATH.match(path) or AIRCRAFT_PATH.match(path)
+                if not match:
+                    server.count(404)
+                    self._send(404, b'Not found')
+                    return
+                delay, status = server.draw()
+                if delay:
+                    time.sleep(delay)
+                if status == 429:
+                    server.count(429)
+                    self._send(429, b'Too Many Requests', {'Retry-After': str(server.retry_after)})
+                    return
+                if status != 200:
+                    server.count(status)
+                    self._send(status, b'Server error')
+                    return
+                if match.re is AIRCRAFT_PATH:
+                    body, etag = server.aircraft_page(match.group(1))
+                else:
+                    body, etag = server.page(match.group(1))
+                if self.headers.get('If-None-Match') == etag:
+                    server.count(304)
+                    self._send(304, b'', {'ETag': etag})
+                    return
+                server.count(200)
+                self._send(200, body, {'ETag': etag, 'Content-Type': 'text/html; charset=utf-8'})
+
+            def _send(self, status, body, headers=None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        """Démarre le serveur dans un thread (usage en benchmark)"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur local de pages de flotte FlightRadar24")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8024)
+    parser.add_argument('--pages', help="Dossier de pages enregistrées ({code}.html)")
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--error-429', type=float, default=0.0, help="Proportion de réponses 429")
+    parser.add_argument('--error-5xx', type=float, default=0.0, help="Proportion de réponses 500/503")
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--catalog', help="Écrit un catalogue CSV synthétique à ce chemin")
+    parser.add_argument('--airlines', type=int, default=3000, help="Nombre de compagnies du catalogue")
+    args = parser.parse_args()
+
+    if args.catalog:
+        write_catalog(args.catalog, args.airlines)
+        print(f"Catalogue de {args.airlines} compagnies écrit dans {args.catalog}")
+    server = ReplayServer(args.host, args.port, args.pages, args.latency_ms, args.jitter_ms,
+                          args.error_429, args.error_5xx, args.retry_after)
+    print(f"Serveur de replay sur {server.url} (Ctrl+C pour arrêter)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ordonnancement des compagnies à scraper par valeur
+
+Au lieu de l'ordre du CSV, les compagnies sont traitées par score décroissant :
+un run interrompu ou limité (--max-airlines, choix 1/2) renvoie d'abord les
+données les plus utiles. Le score est une somme pondérée de critères entre 0 et 1 :
+
+- fleet_size : taille de flotte du catalogue (échelle logarithmique)
+- staleness  : ancienneté du dernier scraping réussi (1 si jamais scrapée)
+- error      : 1 si le run précédent a échoué pour cette compagnie
+- segment    : 1 si la taille de flotte est dans un segment cible
+               (par défaut 2 < flotte <= 25, comme lil_airliner.py)
+"""
+
+import math
+import time
+from datetime import datetime
+
+from delta_scrape import parse_aircraft_count
+
+DEFAULT_WEIGHTS = {'fleet_size': 1.0, 'staleness': 1.0, 'error': 1.0, 'segment': 1.0}
+# Segments (min exclu, max inclus) de taille de flotte
+TARGET_SEGMENTS = ((2, 25),)
+
+
+def parse_weights(text):
+    """"segment=3,fleet_size=0.5" -> poids (les critères absents gardent leur valeur par défaut)"""
+    weights = dict(DEFAULT_WEIGHTS)
+    for item in filter(None, (part.strip() for part in (text or '').split(','))):
+        name, _, value = item.partition('=')
+        if name not in weights:
+            raise ValueError(f"Critère inconnu : {name} (attendu : {', '.join(DEFAULT_WEIGHTS)})")
+        weights[name] = float(value)
+    return weights
+
+
+class ScrapeScheduler:
+    """Trie les compagnies du catalogue (dicts code/name/aircraft_info...) par score décroissant.
+
+    `previous` : résultats du run précédent indexés par code (delta_scrape.load_previous_results).
+    """
+
+    def __init__(self, previous=None, weights=None, segments=TARGET_SEGMENTS, max_age_days=30, now=None):
+        self.previous = previous or {}
+        self.weights = weights or dict(DEFAULT_WEIGHTS)
+        self.segments = segments
+        self.max_age = max_age_days * 86400
+        self.now = now or time.time()
+
+    def components(self, airline, max_log_fleet=1.0):
+        count = parse_aircraft_count(airline.get('aircraft_info')) or 0
+        old = self.previous.get(airline['code'])
+        if old is None or not old.scraped_at:
+            staleness = 1.0
+        else:
+            age = self.now - datetime.fromisoformat(old.scraped_at).timestamp()
+            staleness = min(max(age / self.max_age, 0.0), 1.0) if self.max_age else 1.0
+        return {
+            'fleet_size': math.log1p(count) / max_log_fleet,
+            'staleness': staleness,
+            'error': 1.0 if old is not None and not old.ok else 0.0,
+            'segment': 1.0 if any(low < count <= high for low, high in self.segments) else 0.0,
+        }
+
+    def scores(self, airlines):
+        counts = [parse_aircraft_count(airline.get('aircraft_info')) or 0 for airline in airlines]
+        max_log_fleet = math.log1p(max(counts, default=0)) or 1.0
+        return [
+            sum(self.weights[name] * value for name, value in self.components(airline, max_log_fleet).items())
+            for airline in airlines
+        ]
+
+    def order(self, items, key=lambda item: item):
+        """Éléments triés par score décroissant (ordre d'origine conservé à score égal)"""
+        items = list(items)
+        scores = self.scores([key(item) for item in items])
+        ranked = sorted(range(len(items)), key=lambda i: -scores[i])
+        return [items[i] for i in ranked]
+
+    def select(self, airlines, limit):
+        """Les `limit` compagnies les plus prioritaires, dans l'ordre du catalogue"""
+        keep = {id(airline) for airline in self.order(airlines)[:limit]}
+        return [airline for airline in airlines if id(airline) in keep]
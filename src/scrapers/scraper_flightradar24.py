@@ -1,24 +1,41 @@
-import requests as pyrequests  # pour éviter conflit avec requests de bs4
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
 Scraper pour récupérer les détails de flotte des compagnies aériennes depuis FlightRadar24
 """
 
-import csv
 import requests
-from bs4 import BeautifulSoup
 import time
-import re
 
-import json
-import pandas as pd
 from urllib.parse import urljoin
-import random
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import os
 import sys
+import argparse
+import asyncio
+from datetime import datetime
+
+from rate_limit import AIMDRateController
+from checkpoint_store import CheckpointStore, StoredResults
+from fleet_writers import FleetCSVWriter, FleetParquetWriter, JSONArrayWriter, JSONLWriter, parquet_path
+from fleet_records import AirlineResult
+from telegram_reporter import TelegramReporter
+from scraper_metrics import ScraperMetrics
+from progress import emit_progress
+from aircraft_enrichment import AircraftDetailCache, AircraftEnricher
+from http_cache import HTTPCache
+from fleet_parser import ENGINES, parse_fleet_html
+from delta_scrape import load_previous_results, merge_results, select_delta_airlines
+from scrape_scheduler import ScrapeScheduler, parse_weights
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'utils'))
+from airline_catalog import AirlineCatalog
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
 # Ajout du support .env pour Docker
 try:
     from dotenv import load_dotenv
@@ -34,30 +51,28 @@ except ImportError:
 
 class FlightRadar24Scraper:
 
-    def send_csv_telegram(self, file_path:str):
-        """Envoie un fichier CSV via Telegram si les variables d'env sont définies."""
-        bot_token = os.environ.get('TELEGRAM_BOT_TOKEN')
-        chat_id = os.environ.get('TELEGRAM_CHAT_ID')
-        if not bot_token or not chat_id:
-            print("[TELEGRAM] Variables d'environnement non définies, envoi ignoré.")
-            return
-        url = f"https://api.telegram.org/bot{bot_token}/sendDocument"
-        try:
-            with open(file_path, 'rb') as f:
-                files = {'document': f}
-                data = {'chat_id': chat_id, 'caption': os.path.basename(file_path)}
-                response = pyrequests.post(url, data=data, files=files, timeout=60)
-            if response.status_code == 200:
-                print(f"[TELEGRAM] Fichier envoyé avec succès : {file_path}")
-            else:
-                print(f"[TELEGRAM] Erreur lors de l'envoi : {response.text}")
-        except Exception as e:
-            print(f"[TELEGRAM] Exception lors de l'envoi : {e}")
-    def __init__(self):
+    def __init__(self, cache_path=None, parser_engine='auto', rate_controller=None, compress_output=False,
+                 reporter=None, metrics=None, scheduler=None, output_dir=None):
         self.session = requests.Session()
         self.base_url = "https://www.flightradar24.com"
         self.setup_session()
         self.airlines_data = []
+        # Cache HTTP persistant des pages de flotte (désactivé si cache_path est None)
+        self.cache = HTTPCache(cache_path) if cache_path else None
+        # Moteur de parsing HTML (voir fleet_parser.ENGINES)
+        self.parser_engine = parser_engine
+        # Débit adaptatif partagé par toutes les requêtes vers FlightRadar24
+        self.rate_controller = rate_controller or AIMDRateController()
+        # Compression gzip des fichiers partiels écrits en flux
+        self.compress_output = compress_output
+        # Rapports Telegram envoyés en arrière-plan (delta depuis le rapport précédent)
+        self.reporter = reporter or TelegramReporter()
+        # Instrumentation : latences, octets, parsing, erreurs par statut, débit
+        self.metrics = metrics or ScraperMetrics()
+        # Ordre de traitement par valeur (ScrapeScheduler) ; None : ordre du CSV
+        self.scheduler = scheduler
+        # Dossier des fichiers partiels et du checkpoint par défaut ; None : data/processed
+        self.output_dir = output_dir
         
     def setup_session(self):
         """Configure la session avec des headers et retry strategy"""
@@ -71,48 +86,20 @@ class FlightRadar24Scraper:
         }
         self.session.headers.update(headers)
         
-        # Configuration retry
+        # Configuration retry (429/503 sont laissés au contrôleur de débit, qui respecte Retry-After)
         retry_strategy = Retry(
             total=3,
             backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status_forcelist=[500, 502, 504],
         )
         adapter = HTTPAdapter(max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
 
     def extract_airline_codes_from_csv(self, csv_file):
-        """Extrait les codes des compagnies aériennes depuis le fichier CSV"""
-        airline_codes = []
-        
+        """Extrait les codes des compagnies aériennes depuis le fichier CSV (catalogue en cache)"""
         try:
-            with open(csv_file, 'r', encoding='utf-8') as file:
-                csv_reader = csv.reader(file)
-                
-                # Ignorer les en-têtes
-                next(csv_reader, None)
-                next(csv_reader, None)
-                
-                for row in csv_reader:
-                    if len(row) >= 5 and row[0] and 'airlines' in row[0]:
-                        # Extraire le code de l'URL
-                        url = row[0]
-                        # Format: https://www.flightradar24.com/data/airlines/2i-csb
-                        code_match = re.search(r'/airlines/([^"]+)', url)
-                        if code_match:
-                            code = code_match.group(1)
-                            airline_name = row[2].strip() if row[2] else "Unknown"
-                            sigle = row[3].strip() if row[3] else "Unknown"
-                            aircraft_info = row[4].strip() if row[4] else "0 aircraft"
-                            
-                            airline_codes.append({
-                                'code': code,
-                                'name': airline_name,
-                                'sigle': sigle,
-                                'aircraft_info': aircraft_info,
-                                'url': url
-                            })
-            
+            airline_codes = AirlineCatalog.load(csv_file).as_dicts()
             print(f"Trouvé {len(airline_codes)} compagnies aériennes avec codes")
             return airline_codes
             
@@ -120,229 +107,325 @@ class FlightRadar24Scraper:
             print(f"Erreur lors de l'extraction des codes: {e}")
             return []
 
-    def scrape_fleet_data(self, airline_code: str, airline_name: str) -> dict:
+    def scrape_fleet_data(self, airline_code: str, airline_name: str) -> AirlineResult:
         """Scrape les données de flotte pour une compagnie donnée"""
         fleet_url = f"{self.base_url}/data/airlines/{airline_code}/fleet"
         
         try:
+            self.metrics.observe_sleep(self.rate_controller.wait())
             print(f"Scraping {airline_name} ({airline_code})...")
             
-            response = self.session.get(fleet_url, timeout=10)
+            cached = self.cache.lookup(fleet_url) if self.cache else None
+            start = time.monotonic()
+            try:
+                response = self.session.get(fleet_url, timeout=10, headers=HTTPCache.conditional_headers(cached))
+            except requests.exceptions.RequestException:
+                self.record_response(None, time.monotonic() - start)
+                raise
+            self.record_response(response.status_code, time.monotonic() - start, response.headers.get('Retry-After'))
+            self.metrics.observe_bytes(len(response.content))
+            if cached and response.status_code == 304:
+                return self.cached_result(fleet_url, cached, airline_code, airline_name)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            result = self.parse_fleet_page(response.content, airline_code, airline_name)
+            if self.cache:
+                self.cache.store(fleet_url, response.headers, response.content, result.to_dict())
+            return result
             
-            # Extraire le nombre total d'aircraft
-            total_aircraft_span = soup.find('span', class_='number-of-aircraft')
-            total_aircraft = 0
-            if total_aircraft_span:
-                strong_tag = total_aircraft_span.find('strong')
-                if strong_tag:
-                    total_aircraft = int(strong_tag.text.strip())
-            
-            # Extraire les détails de la flotte avec registrations
-            fleet_details = []
-            aircraft_list = soup.find('dl', id='list-aircraft')
+        except requests.exceptions.RequestException as e:
+            print(f"Erreur réseau pour {airline_name}: {e}")
+            return self.error_result(airline_code, airline_name, e)
+        except Exception as e:
+            print(f"Erreur lors du scraping de {airline_name}: {e}")
+            return self.error_result(airline_code, airline_name, e)
+
+    def record_response(self, status, latency, retry_after=None):
+        """Transmet une réponse (status None = erreur réseau) au contrôleur de débit et aux métriques"""
+        self.rate_controller.record(status, latency, retry_after)
+        self.metrics.observe_request(status, latency)
+
+    def cached_result(self, fleet_url, cached, airline_code, airline_name):
+        """Page inchangée (304) : réutilise le résultat parsé du cache sans reparser"""
+        print(f"[CACHE] Page inchangée pour {airline_name}, résultat en cache réutilisé")
+        result = AirlineResult.from_dict(self.cache.revalidated(fleet_url, cached))
+        result.code = airline_code
+        result.name = airline_name
+        return result
+
+    def annotate_result(self, result, airline):
+        """Ajoute au résultat les informations du catalogue et la date du scraping"""
+        result.original_sigle = airline['sigle']
+        result.original_aircraft_info = airline['aircraft_info']
+        result.scraped_at = datetime.now().isoformat(timespec='seconds')
+        return result
+
+    def error_result(self, airline_code, airline_name, error):
+        """Construit le résultat d'une compagnie en échec"""
+        return AirlineResult(airline_code, airline_name, 'error', error=str(error))
+
+    def parse_fleet_page(self, content, airline_code, airline_name):
+        """Extrait le nombre d'aircraft et le détail de la flotte d'une page HTML"""
+        start = time.perf_counter()
+        total_aircraft, fleet_details = parse_fleet_html(content, self.parser_engine)
+        self.metrics.observe_parse(time.perf_counter() - start)
+        return AirlineResult.from_parsed(airline_code, airline_name, total_aircraft, fleet_details)
+
+    async def scrape_fleet_data_async(self, http, airline_code: str, airline_name: str) -> AirlineResult:
+        """Version asynchrone de scrape_fleet_data (client aiohttp partagé)"""
+        fleet_url = f"{self.base_url}/data/airlines/{airline_code}/fleet"
+        
+        try:
+            self.metrics.observe_sleep(await self.rate_controller.acquire())
+            print(f"Scraping {airline_name} ({airline_code})...")
             
-            if aircraft_list:
-                # Trouver tous les éléments dt qui contiennent les types d'aircraft
-                aircraft_types = aircraft_list.find_all('dt')
-                
-                for dt in aircraft_types:
-                    if 'header' not in dt.get('class', []):
-                        divs = dt.find_all('div')
-                        if len(divs) >= 2:
-                            aircraft_type = divs[0].text.strip()
-                            aircraft_count = divs[1].text.strip()
-                            
-                            try:
-                                count = int(aircraft_count)
-                                
-                                # Récupérer les détails des aircraft individuels
-                                aircraft_details = []
-                                dd = dt.find_next_sibling('dd')
-                                if dd:
-                                    table = dd.find('table')
-                                    if table:
-                                        tbody = table.find('tbody')
-                                        if tbody:
-                                            rows = tbody.find_all('tr')
-                                            for row in rows:
-                                                tds = row.find_all('td')
-                                                if len(tds) >= 2:
-                                                    # Registration - extraire le texte de l'élément <a>
-                                                    reg_cell = tds[0]
-                                                    reg_link = reg_cell.find('a', class_='regLinks')
-                                                    registration = reg_link.text.strip() if reg_link else reg_cell.text.strip()
-                                                    
-                                                    # Aircraft type détaillé - récupérer le type complet
-                                                    detailed_type_cell = tds[1]
-                                                    detailed_type = detailed_type_cell.text.strip() if detailed_type_cell else aircraft_type
-                                                    
-                                                    # Informations supplémentaires si disponibles
-                                                    serial_number = tds[2].text.strip() if len(tds) > 2 else 'N/A'
-                                                    age = tds[3].text.strip() if len(tds) > 3 else 'N/A'
-                                                    
-                                                    aircraft_details.append({
-                                                        'registration': registration,
-                                                        'detailed_type': detailed_type,
-                                                    })
-                                
-                                fleet_details.append({
-                                    'type': aircraft_type,
-                                    'count': count,
-                                    'aircraft_details': aircraft_details
-                                })
-                            except ValueError:
-                                continue
+            cached = self.cache.lookup(fleet_url) if self.cache else None
+            start = time.monotonic()
+            try:
+                response = await http.get(fleet_url, headers=HTTPCache.conditional_headers(cached))
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                self.record_response(None, time.monotonic() - start)
+                raise
+            self.record_response(response.status, time.monotonic() - start, response.headers.get('Retry-After'))
+            async with response:
+                if cached and response.status == 304:
+                    return self.cached_result(fleet_url, cached, airline_code, airline_name)
+                response.raise_for_status()
+                content = await response.read()
+                headers = response.headers
+            self.metrics.observe_bytes(len(content))
             
-            return {
-                'code': airline_code,
-                'name': airline_name,
-                'total_aircraft': total_aircraft,
-                'fleet_details': fleet_details,
-                'status': 'success'
-            }
+            # Parsing et écriture en cache hors de la boucle d'événements : sinon chaque page
+            # parsée bloque les autres requêtes en vol et fausse leur latence mesurée
+            result = await asyncio.to_thread(self.parse_fleet_page, content, airline_code, airline_name)
+            if self.cache:
+                await asyncio.to_thread(self.cache.store, fleet_url, headers, content, result.to_dict())
+            return result
             
-        except requests.exceptions.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             print(f"Erreur réseau pour {airline_name}: {e}")
-            return {
-                'code': airline_code,
-                'name': airline_name,
-                'total_aircraft': 0,
-                'fleet_details': [],
-                'status': 'error',
-                'error': str(e)
-            }
+            return self.error_result(airline_code, airline_name, e)
         except Exception as e:
             print(f"Erreur lors du scraping de {airline_name}: {e}")
-            return {
-                'code': airline_code,
-                'name': airline_name,
-                'total_aircraft': 0,
-                'fleet_details': [],
-                'status': 'error',
-                'error': str(e)
-            }
-
-    def scrape_all_airlines(self, csv_file, max_airlines=None, delay_range=(1, 3)):
-        """Scrape toutes les compagnies aériennes avec retry et sauvegarde intermédiaire"""
-        airline_codes = self.extract_airline_codes_from_csv(csv_file)
+            return self.error_result(airline_code, airline_name, e)
+
+    def processed_dir(self):
+        """Dossier data/processed du projet, ou output_dir s'il est fourni (créé si besoin)"""
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+            return self.output_dir
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        project_root = os.path.dirname(os.path.dirname(script_dir))
+        processed_dir = os.path.join(project_root, "data", "processed")
+        os.makedirs(processed_dir, exist_ok=True)
+        return processed_dir
+
+    def select_airlines(self, csv_file, max_airlines=None, airlines=None):
+        """Compagnies à scraper : liste fournie (mode delta) ou catalogue CSV complet"""
+        airline_codes = airlines if airlines is not None else self.extract_airline_codes_from_csv(csv_file)
         if not airline_codes:
             print("Aucun code de compagnie trouvé")
             return []
         # Limiter le nombre de compagnies si spécifié
-        if max_airlines:
+        if max_airlines and self.scheduler:
+            # Les plus prioritaires, gardées dans l'ordre du catalogue
+            airline_codes = self.scheduler.select(airline_codes, max_airlines)
+            print(f"Limitation aux {max_airlines} compagnies les plus prioritaires")
+        elif max_airlines:
             airline_codes = airline_codes[:max_airlines]
             print(f"Limitation à {max_airlines} compagnies pour test")
-        results = []
-        total = len(airline_codes)
-        # Pour la sauvegarde intermédiaire
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(os.path.dirname(script_dir))
-        processed_dir = os.path.join(project_root, "data", "processed")
-        os.makedirs(processed_dir, exist_ok=True)
-        for i, airline in enumerate(airline_codes, 1):
-            print(f"Progression: {i}/{total}")
-            # Retry automatique sur blocage réseau
-            max_retries = 5
-            retry_wait = 30  # secondes (attente initiale)
-            for attempt in range(1, max_retries + 1):
-                result = self.scrape_fleet_data(airline['code'], airline['name'])
-                if result.get('status') == 'success':
-                    break
-                else:
+        return airline_codes
+
+    def open_checkpoint(self, airline_codes, checkpoint_path=None, resume=False):
+        """Ouvre le store de checkpoint et renvoie les compagnies restant à scraper.
+
+        Les compagnies sont renvoyées sous forme de couples (position, airline),
+        la position dans le catalogue servant à reconstruire l'ordre final.
+        Avec un scheduler, elles sont triées par priorité décroissante.
+        """
+        if checkpoint_path is None:
+            checkpoint_path = os.path.join(self.processed_dir(), 'fleet_checkpoint.sqlite')
+        store = CheckpointStore(checkpoint_path)
+        pending = list(enumerate(airline_codes))
+        if resume:
+            done_codes = store.done_codes()
+            pending = [(position, airline) for position, airline in pending if airline['code'] not in done_codes]
+            print(f"[CHECKPOINT] Reprise : {len(airline_codes) - len(pending)} compagnies déjà scrapées, "
+                  f"{len(pending)} restantes")
+        else:
+            store.clear()
+        if self.scheduler:
+            pending = self.scheduler.order(pending, key=lambda item: item[1])
+        return store, pending
+
+    def scrape_all_airlines(self, csv_file, max_airlines=None, checkpoint_path=None, resume=False,
+                            airlines=None, max_retries=5):
+        """Scrape toutes les compagnies aériennes avec retry et checkpoint après chaque compagnie.
+
+        Le rythme des requêtes (et l'attente avant chaque retry) est fixé par
+        self.rate_controller, qui s'adapte aux réponses du site.
+        """
+        airline_codes = self.select_airlines(csv_file, max_airlines, airlines)
+        if not airline_codes:
+            return []
+        store, pending = self.open_checkpoint(airline_codes, checkpoint_path, resume)
+        total = len(pending)
+        writers = self.open_stream_writers(append=resume)
+        errors = 0
+        try:
+            for i, (position, airline) in enumerate(pending, 1):
+                print(f"Progression: {i}/{total} (débit {self.rate_controller.current_rate:.2f} req/s)")
+                # Retry automatique sur blocage réseau
+                for attempt in range(1, max_retries + 1):
+                    result = self.scrape_fleet_data(airline['code'], airline['name'])
+                    if result.ok:
+                        break
+                    else:
+                        print(f"[RETRY] Tentative {attempt}/{max_retries} pour {airline['name']} après blocage/erreur...")
+                        self.metrics.observe_retry()
+                self.record_result(result, airline, position, store, writers)
+                errors += not result.ok
+                emit_progress(i, total, errors, rate=self.rate_controller.current_rate)
+                # Rapport intermédiaire toutes les 100 compagnies
+                if i % 100 == 0 or i == total:
+                    self.report_progress(i, total, errors, writers)
+            return StoredResults(store.db_path)
+        finally:
+            self.close_run(store, writers)
+
+    def scrape_all_airlines_async(self, csv_file, max_airlines=None, concurrency=8, rps=None,
+                                  max_retries=5, checkpoint_path=None, resume=False, airlines=None):
+        """Scrape toutes les compagnies en parallèle avec un budget global de requêtes/seconde.
+
+        Au plus `concurrency` requêtes sont en vol sur un client HTTP poolé unique,
+        et le débit total suit self.rate_controller, plafonné à `rps` requêtes
+        par seconde si précisé. Les résultats sont renvoyés dans l'ordre du CSV,
+        au même format que scrape_all_airlines.
+        """
+        if aiohttp is None:
+            raise RuntimeError("aiohttp n'est pas installé : pip install aiohttp")
+        airline_codes = self.select_airlines(csv_file, max_airlines, airlines)
+        if not airline_codes:
+            return []
+        if rps:
+            self.rate_controller.set_max_rate(rps)
+        store, pending = self.open_checkpoint(airline_codes, checkpoint_path, resume)
+        writers = self.open_stream_writers(append=resume)
+        try:
+            asyncio.run(self._scrape_airlines_async(pending, store, writers, concurrency, max_retries))
+            return StoredResults(store.db_path)
+        finally:
+            self.close_run(store, writers)
+
+    async def _scrape_airlines_async(self, pending, store, writers, concurrency, max_retries):
+        total = len(pending)
+        queue = asyncio.Queue()
+        for item in pending:
+            queue.put_nowait(item)
+        done = 0
+        errors = 0
+
+        async def worker(http):
+            nonlocal done, errors
+            while True:
+                try:
+                    position, airline = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                for attempt in range(1, max_retries + 1):
+                    result = await self.scrape_fleet_data_async(http, airline['code'], airline['name'])
+                    if result.ok:
+                        break
                     print(f"[RETRY] Tentative {attempt}/{max_retries} pour {airline['name']} après blocage/erreur...")
-                    if attempt < max_retries:
-                        wait_time = retry_wait * attempt
-                        print(f"Attente de {wait_time} secondes avant retry...")
-                        time.sleep(wait_time)
-            result['original_sigle'] = airline['sigle']
-            result['original_aircraft_info'] = airline['aircraft_info']
-            results.append(result)
-            # Sauvegarde intermédiaire toutes les 100 compagnies
-            if i % 100 == 0 or i == total:
-                temp_json = os.path.join(processed_dir, f'fleet_data_partial_{i}.json')
-                temp_csv = os.path.join(processed_dir, f'fleet_data_partial_{i}.csv')
-                print(f"Sauvegarde intermédiaire après {i} compagnies...")
-                self.save_results(results, temp_json)
-                self.save_results_csv(results, temp_csv)
-                self.send_csv_telegram(temp_csv)
-            # Délai aléatoire entre les requêtes
-            if i < total:
-                delay = random.uniform(delay_range[0], delay_range[1])
-                print(f"Attente de {delay:.1f}s...")
-                time.sleep(delay)
-        return results
+                    self.metrics.observe_retry()
+                self.record_result(result, airline, position, store, writers)
+                done += 1
+                errors += not result.ok
+                print(f"Progression: {done}/{total} (débit {self.rate_controller.current_rate:.2f} req/s)")
+                emit_progress(done, total, errors, rate=self.rate_controller.current_rate)
+                if done % 100 == 0 or done == total:
+                    self.report_progress(done, total, errors, writers)
+
+        connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=concurrency)
+        timeout = aiohttp.ClientTimeout(total=10)
+        async with aiohttp.ClientSession(headers=dict(self.session.headers), connector=connector,
+                                         timeout=timeout) as http:
+            await asyncio.gather(*(worker(http) for _ in range(concurrency)))
 
     def save_results(self, results, filename='fleet_data.json'):
-        """Sauvegarde les résultats en JSON"""
+        """Sauvegarde les résultats en JSON (écriture en flux)"""
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, ensure_ascii=False)
+            with JSONArrayWriter(filename) as writer:
+                for airline in results:
+                    writer.write(airline)
             print(f"Résultats sauvegardés dans {filename}")
         except Exception as e:
             print(f"Erreur lors de la sauvegarde: {e}")
 
     def save_results_csv(self, results, filename='fleet_data.csv'):
-        """Sauvegarde les résultats en CSV détaillé avec registrations"""
+        """Sauvegarde les résultats en CSV détaillé avec registrations (écriture en flux)"""
         try:
-            rows = []
-            for airline in results:
-                if airline['fleet_details']:
-                    for aircraft in airline['fleet_details']:
-                        # Si on a des détails individuels d'aircraft
-                        if aircraft.get('aircraft_details'):
-                            for detail in aircraft['aircraft_details']:
-                                rows.append({
-                                    'airline_code': airline['code'],
-                                    'airline_name': airline['name'],
-                                    'sigle': airline['original_sigle'],
-                                    'aircraft_type': aircraft['type'],
-                                    'registration': detail['registration'],
-                                    'detailed_aircraft_type': detail['detailed_type'],
-                                    'total_fleet_size': airline['total_aircraft'],
-                                    'status': airline['status']
-                                })
-                        else:
-                            # Fallback pour les anciens formats
-                            rows.append({
-                                'airline_code': airline['code'],
-                                'airline_name': airline['name'],
-                                'sigle': airline['original_sigle'],
-                                'aircraft_type': aircraft['type'],
-                                'registration': 'N/A',
-                                'detailed_aircraft_type': aircraft['type'],
-                                'total_fleet_size': airline['total_aircraft'],
-                                'status': airline['status']
-                            })
-                else:
-                    # Compagnie sans détails de flotte
-                    rows.append({
-                        'airline_code': airline['code'],
-                        'airline_name': airline['name'],
-                        'sigle': airline['original_sigle'],
-                        'aircraft_type': 'N/A',
-                        'registration': 'N/A',
-                        'detailed_aircraft_type': 'N/A',
-                        'total_fleet_size': airline['total_aircraft'],
-                        'status': airline['status']
-                    })
-            
-            df = pd.DataFrame(rows)
-            df.to_csv(filename, index=False, encoding='utf-8')
+            with FleetCSVWriter(filename) as writer:
+                for airline in results:
+                    writer.write_airline(airline)
             print(f"Résultats CSV sauvegardés dans {filename}")
             
         except Exception as e:
             print(f"Erreur lors de la sauvegarde CSV: {e}")
 
+    def export_results(self, results, json_file, csv_file):
+        """Écrit le JSON complet et le CSV détaillé en une seule passe sur les résultats"""
+        try:
+            # Version Parquet lue en priorité par les analyseurs et le visualiseur, écrite avec
+            # les mêmes lignes que le CSV ; fermée après lui, elle n'est pas plus ancienne
+            with JSONArrayWriter(json_file) as json_writer, \
+                    FleetParquetWriter(parquet_path(csv_file)) as parquet_writer, \
+                    FleetCSVWriter(csv_file) as csv_writer:
+                for airline in results:
+                    json_writer.write(airline)
+                    parquet_writer.write_rows(csv_writer.write_airline(airline))
+            print(f"Résultats sauvegardés dans {json_file} et {csv_file}")
+        except Exception as e:
+            print(f"Erreur lors de la sauvegarde: {e}")
+
+    def record_result(self, result, airline, position, store, writers):
+        """Enregistre une compagnie terminée : checkpoint, fichiers partiels et delta Telegram"""
+        csv_writer, jsonl_writer = writers
+        self.annotate_result(result, airline)
+        store.record(result, position)
+        self.metrics.observe_airline(result.status)
+        self.reporter.add_rows(csv_writer.write_airline(result))
+        jsonl_writer.write(result)
+
+    def report_progress(self, done, total, errors, writers):
+        """Rapport intermédiaire : vide les fichiers partiels et dépose un rapport Telegram"""
+        for writer in writers:
+            writer.flush()
+        print(f"Sauvegarde intermédiaire après {done} compagnies...")
+        self.reporter.report(f"Scraping FlightRadar24 : {done}/{total} compagnies, {errors} erreurs, "
+                             f"débit {self.rate_controller.current_rate:.2f} req/s")
+
+    def close_run(self, store, writers):
+        store.close()
+        for writer in writers:
+            writer.close()
+        self.reporter.close()
+
+    def open_stream_writers(self, append):
+        """Fichiers partiels alimentés au fil du run (CSV détaillé + JSONL par compagnie)"""
+        suffix = '.gz' if self.compress_output else ''
+        processed_dir = self.processed_dir()
+        csv_writer = FleetCSVWriter(os.path.join(processed_dir, 'fleet_data_partial.csv' + suffix), append=append)
+        jsonl_writer = JSONLWriter(os.path.join(processed_dir, 'fleet_data_partial.jsonl' + suffix), append=append)
+        return csv_writer, jsonl_writer
+
     def generate_summary(self, results):
         """Génère un résumé des résultats"""
         total_airlines = len(results)
-        successful_scrapes = len([r for r in results if r['status'] == 'success'])
+        successful_scrapes = len([r for r in results if r.ok])
         failed_scrapes = total_airlines - successful_scrapes
         
-        total_aircraft_scraped = sum(r['total_aircraft'] for r in results if r['status'] == 'success')
+        total_aircraft_scraped = sum(r.total_aircraft for r in results if r.ok)
         
         print("\n" + "="*80)
         print("RÉSUMÉ DU SCRAPING FLIGHTRADAR24")
@@ -353,14 +436,55 @@ class FlightRadar24Scraper:
         print(f"Total aircraft scrapés: {total_aircraft_scraped}")
         print("="*80)
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scraper FlightRadar24 - données de flotte")
+    parser.add_argument('choice', nargs='?', help="1: 10 compagnies, 2: 50 compagnies, 3: toutes")
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help="Scraping concurrent (aiohttp) limité par --concurrency et --rps")
+    parser.add_argument('--concurrency', type=int, default=8, help="Nombre maximal de requêtes en vol")
+    parser.add_argument('--rps', type=float, default=2.0, help="Débit maximal (requêtes par seconde)")
+    parser.add_argument('--initial-rps', type=float, default=None,
+                        help="Débit de départ du contrôleur adaptatif (défaut selon le choix 1-3)")
+    parser.add_argument('--cache', default=None,
+                        help="Chemin du cache HTTP (défaut : data/cache/fleet_http_cache.sqlite)")
+    parser.add_argument('--no-cache', action='store_true', help="Désactive le cache HTTP des pages de flotte")
+    parser.add_argument('--parser', default='auto', choices=('auto',) + ENGINES,
+                        help="Moteur de parsing HTML (auto : lxml si installé)")
+    parser.add_argument('--delta', action='store_true',
+                        help="Ne re-scrape que les compagnies nouvelles, modifiées ou plus anciennes que --max-age-days")
+    parser.add_argument('--max-age-days', type=float, default=30,
+                        help="Âge au-delà duquel une compagnie est re-scrapée en mode delta")
+    parser.add_argument('--order', choices=('priority', 'csv'), default='priority',
+                        help="Ordre de traitement : par priorité (défaut) ou ordre du CSV")
+    parser.add_argument('--priority-weights', type=parse_weights, default=None,
+                        help="Poids du score de priorité, ex. 'segment=3,fleet_size=0.5' "
+                             "(critères : fleet_size, staleness, error, segment)")
+    parser.add_argument('--gzip', action='store_true', help="Compresse les fichiers partiels écrits en flux")
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help="Expose /metrics (Prometheus) et /metrics.json sur ce port pendant le run")
+    parser.add_argument('--enrich', action='store_true',
+                        help="Complète numéro de série / âge manquants via les pages de détail des aircraft")
+    parser.add_argument('--enrich-workers', type=int, default=4,
+                        help="Nombre de requêtes de détail en parallèle (défaut : 4)")
+    parser.add_argument('--resume', action='store_true',
+                        help="Reprend le run précédent en sautant les compagnies déjà scrapées")
+    parser.add_argument('--checkpoint', default=None,
+                        help="Chemin du store de checkpoint (défaut : data/processed/fleet_checkpoint.sqlite)")
+    return parser.parse_args(argv)
+
 def main():
     print("SCRAPER FLIGHTRADAR24 - DONNÉES DE FLOTTE")
     print("="*50)
+    args = parse_args()
     
-    scraper = FlightRadar24Scraper()
     # Chemin absolu vers le fichier CSV
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(os.path.dirname(script_dir))
+    cache_path = None
+    if not args.no_cache:
+        cache_path = args.cache or os.path.join(project_root, "data", "cache", "fleet_http_cache.sqlite")
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+    scraper = FlightRadar24Scraper(cache_path=cache_path, parser_engine=args.parser, compress_output=args.gzip)
     csv_file = os.path.join(project_root, "data", "raw", "flightradar24.csv")
     
     # Vérifier que le fichier CSV existe
@@ -375,40 +499,83 @@ def main():
     print("3. Scraper toutes les compagnies (ATTENTION: très long!)")
     
     # Accepter un argument en ligne de commande ou demander à l'utilisateur
-    if len(sys.argv) > 1:
-        choice = sys.argv[1]
+    if args.choice:
+        choice = args.choice
         print(f"Choix automatique: {choice}")
     else:
         choice = input("Votre choix (1-3): ").strip()
     
     if choice == "1":
         max_airlines = 10
-        delay_range = (0.5, 1.5)
+        initial_rate = 1.0
     elif choice == "2":
         max_airlines = 50
-        delay_range = (1, 2)
+        initial_rate = 0.7
     else:
         max_airlines = None
-        delay_range = (2, 4)
+        initial_rate = 0.35
+    scraper.rate_controller = AIMDRateController(initial_rate=args.initial_rps or initial_rate, max_rate=args.rps)
+    
+    processed_dir = os.path.join(project_root, "data", "processed")
+    os.makedirs(processed_dir, exist_ok=True)
+    json_file = os.path.join(processed_dir, 'fleet_data_complete.json')
+    csv_file_output = os.path.join(processed_dir, 'fleet_data_detailed.csv')
+    
+    airlines = None
+    previous = load_previous_results(json_file) if args.delta or args.order == 'priority' else {}
+    if args.order == 'priority':
+        # Run partiel ou interrompu : les compagnies les plus utiles d'abord
+        scraper.scheduler = ScrapeScheduler(previous, args.priority_weights, max_age_days=args.max_age_days)
+    if args.delta:
+        catalog = scraper.extract_airline_codes_from_csv(csv_file)
+        airlines, reasons = select_delta_airlines(catalog, previous, args.max_age_days)
+        print(f"[DELTA] {len(airlines)} compagnies à re-scraper sur {len(catalog)} : {dict(reasons)}")
+        if not airlines:
+            print("[DELTA] Aucune compagnie à mettre à jour.")
+            if scraper.cache:
+                scraper.cache.close()
+            return
+    
+    if args.metrics_port:
+        scraper.metrics.start_server(args.metrics_port)
     
     print(f"\nDémarrage du scraping...")
-    results = scraper.scrape_all_airlines(csv_file, max_airlines, delay_range)
+    if args.use_async:
+        results = scraper.scrape_all_airlines_async(csv_file, max_airlines, concurrency=args.concurrency,
+                                                    checkpoint_path=args.checkpoint, resume=args.resume,
+                                                    airlines=airlines)
+    else:
+        results = scraper.scrape_all_airlines(csv_file, max_airlines,
+                                              checkpoint_path=args.checkpoint, resume=args.resume,
+                                              airlines=airlines)
     
     if results:
-        # Sauvegarder les résultats dans le dossier processed
-        processed_dir = os.path.join(project_root, "data", "processed")
-        os.makedirs(processed_dir, exist_ok=True)
-        
-        json_file = os.path.join(processed_dir, 'fleet_data_complete.json')
-        csv_file_output = os.path.join(processed_dir, 'fleet_data_detailed.csv')
-        
-        scraper.save_results(results, json_file)
-        scraper.save_results_csv(results, csv_file_output)
         scraper.generate_summary(results)
+        if args.enrich:
+            # Cache par registration partagé entre les runs
+            cache_dir = os.path.join(project_root, "data", "cache")
+            os.makedirs(cache_dir, exist_ok=True)
+            detail_cache = AircraftDetailCache(os.path.join(cache_dir, "aircraft_details.sqlite"))
+            results = AircraftEnricher(scraper, detail_cache, workers=args.enrich_workers).enrich(results)
+        if args.delta:
+            # Fusionner les compagnies re-scrapées dans le run précédent
+            results = merge_results(previous, results, catalog)
+            print(f"[DELTA] {len(results)} compagnies après fusion avec le run précédent")
+        
+        # Sauvegarder les résultats dans le dossier processed
+        scraper.export_results(results, json_file, csv_file_output)
+        if args.enrich:
+            detail_cache.close()
+        if scraper.cache:
+            scraper.cache.print_stats()
         
         print(f"\nScraping terminé! {len(results)} compagnies traitées.")
     else:
         print("Aucun résultat obtenu.")
+    scraper.metrics.write_report(os.path.join(processed_dir, 'fleet_scrape_report.json'))
+    scraper.metrics.stop_server()
+    if scraper.cache:
+        scraper.cache.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Instrumentation du scraper : histogrammes de latence, octets, temps de parsing,
+erreurs par statut, débit courant. Exposition Prometheus / JSON et rapport de fin de run.
+"""
+
+import json
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+PARSE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0, float('inf'))
+
+
+class Histogram:
+    """Histogramme cumulatif à la Prometheus"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def quantile(self, q):
+        """Estimation d'un quantile (borne supérieure du bucket qui le contient)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return self.buckets[-1]
+
+    def to_dict(self):
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            buckets['+Inf' if bound == float('inf') else str(bound)] = cumulative
+        return {'count': self.count, 'sum': self.sum, 'p50': self.quantile(0.5),
+                'p99': self.quantile(0.99), 'buckets': buckets}
+
+    def prometheus_lines(self, name, help_text):
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'{name}_bucket{{le="{le}"}} {cumulative}')
+        lines.append(f"{name}_sum {self.sum}")
+        lines.append(f"{name}_count {self.count}")
+        return lines
+
+
+class ScraperMetrics:
+    """Compteurs d'un run de scraping, partagés entre threads et coroutines"""
+
+    def __init__(self, throughput_window=60):
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+        self.request_latency = Histogram(LATENCY_BUCKETS)
+        self.parse_time = Histogram(PARSE_BUCKETS)
+        self.status_counts = Counter()
+        self.bytes_received = 0
+        self.sleep_seconds = 0.0
+        self.retries = 0
+        self.airlines = Counter()
+        self.throughput_window = throughput_window
+        self._recent = deque()
+        self.server = None
+
+    def observe_request(self, status, latency):
+        """status None = erreur réseau (timeout, connexion refusée...)"""
+        with self.lock:
+            self.request_latency.observe(latency)
+            self.status_counts['network_error' if status is None else str(status)] += 1
+
+    def observe_bytes(self, nbytes):
+        with self.lock:
+            self.bytes_received += nbytes
+
+    def observe_parse(self, seconds):
+        with self.lock:
+            self.parse_time.observe(seconds)
+
+    def observe_sleep(self, seconds):
+        with self.lock:
+            self.sleep_seconds += seconds
+
+    def observe_retry(self):
+        with self.lock:
+            self.retries += 1
+
+    def observe_airline(self, status):
+        now = time.time()
+        with self.lock:
+            self.airlines[status] += 1
+            self._recent.append(now)
+            while self._recent and self._recent[0] < now - self.throughput_window:
+                self._recent.popleft()
+
+    def throughput(self):
+        """Compagnies/seconde sur la fenêtre glissante récente"""
+        now = time.time()
+        with self.lock:
+            while self._recent and self._recent[0] < now - self.throughput_window:
+                self._recent.popleft()
+            window = min(self.throughput_window, max(now - self.started_at, 1e-9))
+            return len(self._recent) / window
+
+    def to_dict(self):
+        throughput = self.throughput()
+        with self.lock:
+            elapsed = time.time() - self.started_at
+            done = sum(self.airlines.values())
+            return {
+                'elapsed_seconds': elapsed,
+                'airlines': dict(self.airlines),
+                'airlines_per_second': done / elapsed if elapsed else 0.0,
+                'current_airlines_per_second': throughput,
+                'requests_by_status': dict(self.status_counts),
+                'retries': self.retries,
+                'bytes_received': self.bytes_received,
+                'request_latency_seconds': self.request_latency.to_dict(),
+                'parse_seconds': self.parse_time.to_dict(),
+                # Répartition du temps (en mode async les durées se chevauchent)
+                'time_breakdown_seconds': {
+                    'network': self.request_latency.sum,
+                    'parse': self.parse_time.sum,
+                    'sleep': self.sleep_seconds,
+                },
+            }
+
+    def to_prometheus(self):
+        throughput = self.throughput()
+        with self.lock:
+            lines = self.request_latency.prometheus_lines(
+                'fr24_request_latency_seconds', "Latence des requêtes de pages de flotte")
+            lines += self.parse_time.prometheus_lines('fr24_parse_seconds', "Temps de parsing par page")
+            lines += ["# HELP fr24_requests_total Requêtes par statut HTTP", "# TYPE fr24_requests_total counter"]
+            lines += [f'fr24_requests_total{{status="{status}"}} {count}'
+                      for status, count in sorted(self.status_counts.items())]
+            lines += ["# HELP fr24_airlines_total Compagnies traitées par statut", "# TYPE fr24_airlines_total counter"]
+            lines += [f'fr24_airlines_total{{status="{status}"}} {count}'
+                      for status, count in sorted(self.airlines.items())]
+            lines += [
+                "# TYPE fr24_retries_total counter", f"fr24_retries_total {self.retries}",
+                "# TYPE fr24_bytes_received_total counter", f"fr24_bytes_received_total {self.bytes_received}",
+                "# TYPE fr24_sleep_seconds_total counter", f"fr24_sleep_seconds_total {self.sleep_seconds}",
+                "# TYPE fr24_airlines_per_second gauge", f"fr24_airlines_per_second {throughput}",
+            ]
+        return '\n'.join(lines) + '\n'
+
+    def start_server(self, port, host='0.0.0.0'):
+        """Expose /metrics (Prometheus) et /metrics.json pendant le run"""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics':
+                    body, content_type = metrics.to_prometheus().encode('utf-8'), 'text/plain; version=0.0.4'
+                elif self.path == '/metrics.json':
+                    body, content_type = json.dumps(metrics.to_dict()).encode('utf-8'), 'application/json'
+                else:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        print(f"[METRICS] Endpoint disponible sur http://{host}:{self.server.server_address[1]}/metrics")
+        return self.server
+
+    def stop_server(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def write_report(self, path):
+        """Rapport JSON de fin de run"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        print(f"[METRICS] Rapport de run écrit dans {path}")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Cache SQLite des réponses Google Custom Search (recherches LinkedIn)
+
+Clé : nom de compagnie normalisé + modèle de requête. Une compagnie déjà
+cherchée avec le même modèle n'est pas re-demandée à l'API tant que la
+réponse a moins de `max_age_days` jours.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'utils'))
+# Même normalisation que les jointures de utils (fusion.py, fleet_size_by_company.py)
+from name_normalizer import normalize_name as normalize_company
+
+
+class SearchCache:
+    """Réponses brutes (items) des requêtes Custom Search, avec durée de validité"""
+
+    def __init__(self, db_path, max_age_days=30):
+        self.db_path = db_path
+        self.max_age = max_age_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS searches (
+                company TEXT NOT NULL,
+                template TEXT NOT NULL,
+                query TEXT NOT NULL,
+                items TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (company, template)
+            )
+            """
+        )
+        self.conn.commit()
+
+    def lookup(self, company, template):
+        """Réponse en cache ({'items': [...]}) ou None si absente ou expirée"""
+        row = self.conn.execute(
+            "SELECT items FROM searches WHERE company = ? AND template = ? AND fetched_at >= ?",
+            (normalize_company(company), template, time.time() - self.max_age),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return {'items': json.loads(row[0])}
+
+    def store(self, company, template, query, response):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO searches (company, template, query, items, fetched_at) VALUES (?, ?, ?, ?, ?)",
+            (normalize_company(company), template, query,
+             json.dumps(response.get('items', []), ensure_ascii=False), time.time()),
+        )
+        self.conn.commit()
+
+    def purge(self):
+        """Supprime les réponses expirées"""
+        cursor = self.conn.execute("DELETE FROM searches WHERE fetched_at < ?", (time.time() - self.max_age,))
+        self.conn.commit()
+        return cursor.rowcount
+
+    def print_stats(self):
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0.0
+        print(f"[CACHE] {self.hits} hits, {self.misses} misses (taux {hit_rate:.0%}) : "
+              f"{self.hits} requêtes de quota économisées")
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Exécution concurrente des requêtes Google Custom Search sous quota
+
+- pool de threads borné (un client par thread : httplib2 n'est pas thread-safe)
+- débit par seconde piloté par AIMDRateController (réduit sur 429 / rateLimitExceeded)
+- quota journalier compté dans un fichier partagé entre les runs
+- arrêt propre quand le quota du jour est épuisé : les requêtes restantes sont
+  écrites dans un fichier de reprise
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+from progress import emit_progress
+from rate_limit import AIMDRateController
+
+try:
+    from zoneinfo import ZoneInfo
+    QUOTA_TIMEZONE = ZoneInfo('America/Los_Angeles')  # remise à zéro du quota Google
+except Exception:
+    QUOTA_TIMEZONE = timezone.utc
+
+# Raisons d'erreur Google signalant la fin du quota du jour
+DAILY_QUOTA_REASONS = ('dailyLimitExceeded', 'quotaExceeded', 'per day')
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+
+class QuotaExhausted(Exception):
+    """Quota journalier épuisé : plus aucune requête ne doit partir aujourd'hui"""
+
+
+def error_status(error):
+    """Statut HTTP d'une erreur googleapiclient (HttpError), None sinon"""
+    resp = getattr(error, 'resp', None)
+    status = getattr(resp, 'status', None)
+    return int(status) if status is not None else None
+
+
+def is_daily_quota_error(error):
+    content = getattr(error, 'content', b'') or b''
+    if isinstance(content, bytes):
+        content = content.decode('utf-8', 'replace')
+    text = f"{content} {error}"
+    return error_status(error) in (403, 429) and any(reason in text for reason in DAILY_QUOTA_REASONS)
+
+
+class DailyQuota:
+    """Compteur de requêtes du jour, persistant (fichier JSON) et partagé entre threads"""
+
+    def __init__(self, path, per_day=100):
+        self.path = path
+        self.per_day = per_day
+        self.lock = threading.Lock()
+        self.day, self.used = self._load()
+
+    @staticmethod
+    def today():
+        return datetime.now(QUOTA_TIMEZONE).date().isoformat()
+
+    def _load(self):
+        today = self.today()
+        if self.path and os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('day') == today:
+                return today, state.get('used', 0)
+        return today, 0
+
+    def _save(self):
+        if not self.path:
+            return
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'day': self.day, 'used': self.used}, f)
+        os.replace(tmp_path, self.path)
+
+    def take(self):
+        """Réserve une requête du quota du jour ; False si le quota est épuisé"""
+        with self.lock:
+            today = self.today()
+            if today != self.day:
+                self.day, self.used = today, 0
+            if self.used >= self.per_day:
+                return False
+            self.used += 1
+            self._save()
+            return True
+
+    def exhaust(self):
+        """Google a signalé la fin du quota : on aligne le compteur local"""
+        with self.lock:
+            self.used = max(self.used, self.per_day)
+            self._save()
+
+    @property
+    def remaining(self):
+        with self.lock:
+            return max(0, self.per_day - self.used) if self.day == self.today() else self.per_day
+
+
+class SearchExecutor:
+    """Lance des requêtes (clé, requête) en parallèle dans les limites de quota.
+
+    `build_service` crée un client Custom Search (appelé une fois par thread) ;
+    `search(service, query)` exécute une requête et renvoie la réponse JSON.
+    Les erreurs transitoires (429, 5xx) sont retentées avec backoff ; les autres
+    erreurs ne sont pas retentées pour ne pas consommer de quota inutilement.
+    """
+
+    def __init__(self, build_service, search, quota, per_second=1.0, workers=4, max_retries=4,
+                 backoff=2.0):
+        self.build_service = build_service
+        self.search = search
+        self.quota = quota
+        self.rate_controller = AIMDRateController(initial_rate=per_second, max_rate=per_second,
+                                                  min_rate=min(0.05, per_second))
+        self.workers = workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.local = threading.local()
+        self.stop = threading.Event()
+
+    def service(self):
+        if not hasattr(self.local, 'service'):
+            self.local.service = self.build_service()
+        return self.local.service
+
+    def execute(self, query):
+        """Réponse JSON de la requête ; None si elle n'a pas pu partir (quota, arrêt)"""
+        for attempt in range(1, self.max_retries + 1):
+            if self.stop.is_set():
+                return None
+            if not self.quota.take():
+                raise QuotaExhausted()
+            self.rate_controller.wait()
+            start = time.monotonic()
+            try:
+                response = self.search(self.service(), query)
+            except Exception as e:
+                status = error_status(e)
+                self.rate_controller.record(status, time.monotonic() - start)
+                if is_daily_quota_error(e):
+                    self.quota.exhaust()
+                    raise QuotaExhausted() from e
+                if status not in RETRYABLE_STATUSES or attempt == self.max_retries:
+                    raise
+                delay = self.backoff ** attempt + random.uniform(0, 1)
+                print(f"[SEARCH] Erreur {status}, nouvelle tentative {attempt + 1}/{self.max_retries} dans {delay:.1f}s")
+                time.sleep(delay)
+                continue
+            self.rate_controller.record(200, time.monotonic() - start)
+            return response
+        return None
+
+    def run(self, items, on_result=None):
+        """Exécute les requêtes [(clé, requête)].
+
+        Renvoie (résultats, erreurs, restantes) : réponses par clé, exceptions
+        définitives par clé, et liste des (clé, requête) non exécutées à cause
+        du quota ou d'erreurs transitoires persistantes, à reprendre plus tard.
+        """
+        results, errors, remaining = {}, {}, []
+        self.stop.clear()
+        print(f"[SEARCH] {len(items)} requêtes, quota restant aujourd'hui : {self.quota.remaining}, "
+              f"{self.workers} threads")
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self.execute, query): (key, query) for key, query in items}
+            for i, future in enumerate(as_completed(futures), 1):
+                key, query = futures[future]
+                try:
+                    response = future.result()
+                except QuotaExhausted:
+                    if not self.stop.is_set():
+                        print("[SEARCH] Quota journalier épuisé, arrêt des requêtes")
+                        self.stop.set()
+                    remaining.append((key, query))
+                except Exception as e:
+                    if error_status(e) in RETRYABLE_STATUSES:
+                        remaining.append((key, query))
+                    else:
+                        errors[key] = e
+                else:
+                    if response is None:
+                        remaining.append((key, query))
+                    else:
+                        results[key] = response
+                        if on_result:
+                            on_result(key, response)
+                emit_progress(i, len(items), len(errors), rate=self.rate_controller.current_rate)
+                if i % 10 == 0 or i == len(items):
+                    print(f"Progression: {i}/{len(items)} requêtes traitées.")
+        # Les restantes gardent l'ordre d'origine
+        order = {key: position for position, (key, _) in enumerate(items)}
+        remaining.sort(key=lambda item: order[item[0]])
+        return results, errors, remaining
+
+
+def save_pending(path, remaining, **context):
+    """Écrit le fichier de reprise (ou le supprime s'il ne reste rien)"""
+    if not remaining:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(dict(context, saved_at=datetime.now().isoformat(timespec='seconds'),
+                       remaining=[{'key': key, 'query': query} for key, query in remaining]),
+                  f, ensure_ascii=False, indent=2)
+    print(f"[SEARCH] {len(remaining)} requêtes restantes enregistrées dans {path}")
+
+
+def load_pending(path):
+    """Contenu du fichier de reprise, ou None"""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        pending = json.load(f)
+    pending['remaining'] = [(item['key'], item['query']) for item in pending['remaining']]
+    return pending
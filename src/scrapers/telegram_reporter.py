@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Envoi des rapports de progression Telegram en arrière-plan
+
+Le scraper ne fait qu'ajouter des lignes à un tampon et déposer un rapport
+dans une file bornée ; un thread dédié compresse les lignes reçues depuis le
+rapport précédent (delta) et les envoie. Si la file est pleine, les rapports
+en attente sont fusionnés en un seul au lieu de bloquer le scraping.
+"""
+
+import csv
+import gzip
+import io
+import os
+import queue
+import threading
+
+import requests
+
+from fleet_writers import CSV_COLUMNS
+
+_STOP = object()
+
+
+class TelegramReporter:
+    """Uploader Telegram non bloquant (fichiers delta gzip + résumé en légende)"""
+
+    def __init__(self, bot_token=None, chat_id=None, api_url=None, max_queue=3, timeout=60, enabled=True):
+        self.bot_token = bot_token or os.environ.get('TELEGRAM_BOT_TOKEN')
+        self.chat_id = chat_id or os.environ.get('TELEGRAM_CHAT_ID')
+        # TELEGRAM_API_URL permet de viser un serveur local de test
+        self.api_url = (api_url or os.environ.get('TELEGRAM_API_URL', 'https://api.telegram.org')).rstrip('/')
+        self.timeout = timeout
+        # enabled=False : jamais d'envoi, même avec TELEGRAM_* définies (benchmarks, tests)
+        self.enabled = enabled and bool(self.bot_token and self.chat_id)
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.rows = []
+        self.reports = 0
+        self.sent = 0
+        self.coalesced = 0
+        self.thread = None
+        if not enabled:
+            print("[TELEGRAM] Rapports désactivés.")
+        elif not self.enabled:
+            print("[TELEGRAM] Variables d'environnement non définies, rapports désactivés.")
+
+    def add_rows(self, rows):
+        """Ajoute des lignes CSV au delta du prochain rapport"""
+        if self.enabled:
+            self.rows.extend(rows)
+
+    def report(self, summary):
+        """Dépose un rapport (delta courant + résumé) sans attendre l'envoi"""
+        if not self.enabled:
+            return
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name='telegram-reporter', daemon=True)
+            self.thread.start()
+        self.reports += 1
+        job = {'index': self.reports, 'rows': self.rows, 'summary': summary}
+        self.rows = []
+        try:
+            self.queue.put_nowait(job)
+        except queue.Full:
+            # File saturée : on fusionne les rapports en attente avec le nouveau
+            merged_rows = []
+            while True:
+                try:
+                    stale = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if stale is _STOP:
+                    continue
+                merged_rows.extend(stale['rows'])
+                self.coalesced += 1
+            job['rows'] = merged_rows + job['rows']
+            self.queue.put_nowait(job)
+            print(f"[TELEGRAM] File saturée, {self.coalesced} rapport(s) fusionné(s) au total")
+
+    def _run(self):
+        while True:
+            job = self.queue.get()
+            if job is _STOP:
+                return
+            try:
+                self._send(job)
+                self.sent += 1
+            except Exception as e:
+                print(f"[TELEGRAM] Exception lors de l'envoi : {e}")
+
+    def _send(self, job):
+        caption = job['summary'][:1024]
+        if not job['rows']:
+            url = f"{self.api_url}/bot{self.bot_token}/sendMessage"
+            response = requests.post(url, data={'chat_id': self.chat_id, 'text': caption}, timeout=self.timeout)
+        else:
+            buffer = io.BytesIO()
+            with gzip.GzipFile(fileobj=buffer, mode='wb') as gz, io.TextIOWrapper(gz, encoding='utf-8', newline='') as text:
+                writer = csv.DictWriter(text, fieldnames=CSV_COLUMNS, lineterminator='\n')
+                writer.writeheader()
+                writer.writerows(job['rows'])
+            filename = f"fleet_delta_{job['index']:04d}.csv.gz"
+            url = f"{self.api_url}/bot{self.bot_token}/sendDocument"
+            response = requests.post(url, data={'chat_id': self.chat_id, 'caption': caption},
+                                     files={'document': (filename, buffer.getvalue(), 'application/gzip')},
+                                     timeout=self.timeout)
+        if response.status_code == 200:
+            print(f"[TELEGRAM] Rapport {job['index']} envoyé ({len(job['rows'])} lignes)")
+        else:
+            print(f"[TELEGRAM] Erreur lors de l'envoi : {response.text}")
+
+    def close(self, timeout=120):
+        """Envoie le dernier delta éventuel puis attend la fin des envois en cours"""
+        if self.thread is None:
+            return
+        if self.rows:
+            self.report(f"Fin du run : {len(self.rows)} lignes restantes")
+        self.queue.put(_STOP)
+        self.thread.join(timeout)
+        self.thread = None
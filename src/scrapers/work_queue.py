@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+File de travail partagée (SQLite) pour répartir le scraping FlightRadar24 sur plusieurs workers
+
+Usage (même fichier de file sur un volume partagé) :
+    python src/scrapers/work_queue.py init   --queue /shared/fleet_queue.sqlite
+    python src/scrapers/work_queue.py work   --queue /shared/fleet_queue.sqlite --worker-id worker-1
+    python src/scrapers/work_queue.py status --queue /shared/fleet_queue.sqlite
+    python src/scrapers/work_queue.py export --queue /shared/fleet_queue.sqlite
+
+Chaque worker prend des codes en bail (lease) pour une durée limitée ; un bail
+expiré (worker planté ou bloqué) est remis en file et repris par un autre worker.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import time
+
+from fleet_records import AirlineResult
+from scraper_flightradar24 import FlightRadar24Scraper
+
+
+class LeaseQueue:
+    """File de codes compagnie avec baux expirables, partagée entre processus/machines"""
+
+    def __init__(self, db_path, lease_seconds=300, max_attempts=5):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        # Pas de WAL : le fichier peut être sur un volume réseau partagé
+        self.conn = sqlite3.connect(db_path, timeout=60, isolation_level=None)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                code TEXT PRIMARY KEY,
+                position INTEGER NOT NULL,
+                airline TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                worker TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                result TEXT,
+                updated_at REAL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, position)")
+
+    def enqueue(self, airlines):
+        """Ajoute les compagnies à la file (les codes déjà présents sont ignorés)"""
+        self.conn.execute("BEGIN IMMEDIATE")
+        before = self.conn.total_changes
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO jobs (code, position, airline, updated_at) VALUES (?, ?, ?, ?)",
+            [(airline['code'], position, json.dumps(airline, ensure_ascii=False), time.time())
+             for position, airline in enumerate(airlines)],
+        )
+        self.conn.execute("COMMIT")
+        return self.conn.total_changes - before
+
+    def reclaim_expired(self):
+        """Remet en file les codes dont le bail a expiré"""
+        cursor = self.conn.execute(
+            "UPDATE jobs SET state = 'pending', worker = NULL, lease_expires = NULL "
+            "WHERE state = 'leased' AND lease_expires < ?",
+            (time.time(),),
+        )
+        return cursor.rowcount
+
+    def lease(self, worker_id, batch=10):
+        """Prend en bail jusqu'à `batch` codes en attente, renvoie [(position, airline)]"""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            reclaimed = self.reclaim_expired()
+            if reclaimed:
+                print(f"[QUEUE] {reclaimed} bail(s) expiré(s) remis en file")
+            rows = self.conn.execute(
+                "SELECT code, position, airline FROM jobs WHERE state = 'pending' ORDER BY position LIMIT ?",
+                (batch,),
+            ).fetchall()
+            expires = time.time() + self.lease_seconds
+            self.conn.executemany(
+                "UPDATE jobs SET state = 'leased', worker = ?, lease_expires = ?, updated_at = ? WHERE code = ?",
+                [(worker_id, expires, time.time(), code) for code, _, _ in rows],
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return [(position, json.loads(airline)) for _, position, airline in rows]
+
+    def renew(self, worker_id, codes):
+        """Prolonge le bail des codes encore tenus par ce worker, renvoie l'ensemble de ces codes"""
+        codes = list(codes)
+        if not codes:
+            return set()
+        placeholders = ', '.join('?' * len(codes))
+        self.conn.execute(
+            f"UPDATE jobs SET lease_expires = ? WHERE worker = ? AND state = 'leased' AND code IN ({placeholders})",
+            [time.time() + self.lease_seconds, worker_id] + codes,
+        )
+        return {code for (code,) in self.conn.execute(
+            f"SELECT code FROM jobs WHERE worker = ? AND state = 'leased' AND code IN ({placeholders})",
+            [worker_id] + codes,
+        )}
+
+    def complete(self, worker_id, result):
+        """Enregistre le résultat d'un code scrapé avec succès.
+
+        Ignoré (renvoie False) si le worker ne tient plus le bail : un bail
+        expiré a pu être repris, voire terminé, par un autre worker.
+        """
+        cursor = self.conn.execute(
+            "UPDATE jobs SET state = 'done', lease_expires = NULL, result = ?, updated_at = ? "
+            "WHERE code = ? AND worker = ? AND state = 'leased'",
+            (json.dumps(result.to_dict(), ensure_ascii=False), time.time(), result.code, worker_id),
+        )
+        return cursor.rowcount > 0
+
+    def fail(self, worker_id, result):
+        """Échec : le code est remis en file, ou marqué failed après max_attempts tentatives.
+
+        Ignoré (renvoie False) si le worker ne tient plus le bail, comme complete().
+        """
+        cursor = self.conn.execute(
+            "UPDATE jobs SET attempts = attempts + 1, lease_expires = NULL, result = ?, updated_at = ?, "
+            "state = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END "
+            "WHERE code = ? AND worker = ? AND state = 'leased'",
+            (json.dumps(result.to_dict(), ensure_ascii=False), time.time(), self.max_attempts, result.code, worker_id),
+        )
+        return cursor.rowcount > 0
+
+    def stats(self):
+        counts = dict(self.conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+        return {state: counts.get(state, 0) for state in ('pending', 'leased', 'done', 'failed')}
+
+    def iter_results(self):
+        """Résultats terminés (succès et échecs définitifs) dans l'ordre du catalogue"""
+        for (result,) in self.conn.execute(
+            "SELECT result FROM jobs WHERE state IN ('done', 'failed') ORDER BY position"
+        ):
+            yield AirlineResult.from_dict(json.loads(result))
+
+    def close(self):
+        self.conn.close()
+
+
+def run_worker(queue, scraper, worker_id, batch=10, poll_interval=15):
+    """Boucle d'un worker : prend des codes en bail, les scrape et enregistre les résultats.
+
+    S'arrête quand il ne reste plus de code en attente ni en bail chez un autre
+    worker ; tant que des baux sont actifs ailleurs, le worker attend qu'ils
+    se terminent ou expirent.
+    """
+    done = 0
+    while True:
+        leased = queue.lease(worker_id, batch)
+        if not leased:
+            stats = queue.stats()
+            if stats['leased'] == 0 and stats['pending'] == 0:
+                break
+            print(f"[QUEUE] Rien à prendre, {stats['leased']} code(s) en bail ailleurs, attente {poll_interval}s...")
+            time.sleep(poll_interval)
+            continue
+        for i, (_, airline) in enumerate(leased):
+            # Tout le reste du lot est renouvelé : un lot lent ne perd pas ses baux en cours de route
+            held = queue.renew(worker_id, [other['code'] for _, other in leased[i:]])
+            if airline['code'] not in held:
+                print(f"[QUEUE] Bail perdu pour {airline['code']}, repris par un autre worker")
+                continue
+            result = scraper.annotate_result(scraper.scrape_fleet_data(airline['code'], airline['name']), airline)
+            scraper.metrics.observe_airline(result.status)
+            recorded = queue.complete(worker_id, result) if result.ok else queue.fail(worker_id, result)
+            if not recorded:
+                print(f"[QUEUE] Bail expiré pour {airline['code']} : résultat ignoré")
+                continue
+            done += 1
+        stats = queue.stats()
+        print(f"[QUEUE] {worker_id} : {done} traitées | file : {stats} "
+              f"(débit {scraper.rate_controller.current_rate:.2f} req/s)")
+    return done
+
+
+def main():
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(os.path.dirname(script_dir))
+    processed_dir = os.path.join(project_root, "data", "processed")
+
+    parser = argparse.ArgumentParser(description="File de travail partagée pour le scraping FlightRadar24")
+    parser.add_argument('command', choices=('init', 'work', 'status', 'export'))
+    parser.add_argument('--queue', default=os.path.join(processed_dir, 'fleet_queue.sqlite'))
+    parser.add_argument('--csv', default=os.path.join(project_root, "data", "raw", "flightradar24.csv"))
+    parser.add_argument('--max-airlines', type=int, default=None)
+    parser.add_argument('--worker-id', default=f"{socket.gethostname()}-{os.getpid()}")
+    parser.add_argument('--batch', type=int, default=10, help="Nombre de codes pris en bail à la fois")
+    parser.add_argument('--lease-seconds', type=int, default=600)
+    parser.add_argument('--cache', default=None, help="Cache HTTP local du worker")
+    args = parser.parse_args()
+
+    queue = LeaseQueue(args.queue, lease_seconds=args.lease_seconds)
+    try:
+        if args.command == 'init':
+            scraper = FlightRadar24Scraper()
+            airlines = scraper.select_airlines(args.csv, args.max_airlines)
+            added = queue.enqueue(airlines)
+            print(f"[QUEUE] {added} compagnies ajoutées à {args.queue} : {queue.stats()}")
+        elif args.command == 'work':
+            scraper = FlightRadar24Scraper(cache_path=args.cache)
+            done = run_worker(queue, scraper, args.worker_id, args.batch)
+            print(f"[QUEUE] Worker {args.worker_id} terminé : {done} compagnies traitées")
+        elif args.command == 'status':
+            print(f"[QUEUE] {queue.stats()}")
+        else:
+            scraper = FlightRadar24Scraper()
+            json_file = os.path.join(processed_dir, 'fleet_data_complete.json')
+            csv_file = os.path.join(processed_dir, 'fleet_data_detailed.csv')
+            scraper.export_results(queue.iter_results(), json_file, csv_file)
+    finally:
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Catalogue des compagnies de l'export FlightRadar24 (data/raw/flightradar24.csv)
+
+Le CSV brut est analysé une seule fois en une table typée (code, nom, sigle,
+nombre d'aircraft, url), enregistrée dans un cache binaire (pickle) à côté
+du CSV : flightradar24.csv -> flightradar24.catalog.pickle. Le cache est
+réutilisé tant que le CSV n'a pas changé (date de modification et taille,
+puis empreinte SHA-256 si seule la date a bougé).
+
+Recherches en O(1) par code (catalog.get('2i-csb')) et par nom normalisé
+(catalog.find_name('21 Air'), voir name_normalizer.py).
+
+Usage :
+    python src/utils/airline_catalog.py [data/raw/flightradar24.csv] [--code 2i-csb] [--name "21 Air"]
+"""
+
+import argparse
+import csv
+import hashlib
+import os
+import pickle
+import re
+from dataclasses import astuple, dataclass
+
+from name_normalizer import normalize_name
+
+DEFAULT_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..',
+                           'data', 'raw', 'flightradar24.csv')
+# À incrémenter quand le format de la table change (invalide les caches existants)
+CACHE_VERSION = 1
+
+CODE_PATTERN = re.compile(r'/airlines/([^"]+)')
+COUNT_PATTERN = re.compile(r'\d+')
+
+
+@dataclass(slots=True, frozen=True)
+class Airline:
+    code: str
+    name: str
+    sigle: str
+    aircraft_count: int
+    aircraft_info: str
+    url: str
+
+    def to_dict(self):
+        """Forme historique d'extract_airline_codes_from_csv (sans aircraft_count)"""
+        return {
+            'code': self.code,
+            'name': self.name,
+            'sigle': self.sigle,
+            'aircraft_info': self.aircraft_info,
+            'url': self.url,
+        }
+
+
+def parse_catalog_csv(csv_path):
+    """Compagnies du CSV brut, dans l'ordre du fichier (les doublons sont conservés)"""
+    airlines = []
+    with open(csv_path, 'r', encoding='utf-8') as file:
+        csv_reader = csv.reader(file)
+        # Ignorer les en-têtes
+        next(csv_reader, None)
+        next(csv_reader, None)
+        for row in csv_reader:
+            if len(row) < 5 or not row[0] or 'airlines' not in row[0]:
+                continue
+            # Format: https://www.flightradar24.com/data/airlines/2i-csb
+            code_match = CODE_PATTERN.search(row[0])
+            if not code_match:
+                continue
+            aircraft_info = row[4].strip() if row[4] else "0 aircraft"
+            count = COUNT_PATTERN.search(aircraft_info)
+            airlines.append(Airline(
+                code=code_match.group(1),
+                name=row[2].strip() if row[2] else "Unknown",
+                sigle=row[3].strip() if row[3] else "Unknown",
+                aircraft_count=int(count.group()) if count else 0,
+                aircraft_info=aircraft_info,
+                url=row[0],
+            ))
+    return airlines
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path(csv_path):
+    return os.path.splitext(csv_path)[0] + '.catalog.pickle'
+
+
+class AirlineCatalog:
+    """Table des compagnies avec index par code et par nom"""
+
+    def __init__(self, airlines, source=None):
+        self.airlines = list(airlines)
+        self.source = source
+        self.by_code = {}
+        self.by_name = {}
+        for airline in self.airlines:
+            # Une compagnie listée plusieurs fois : la première occurrence fait foi
+            self.by_code.setdefault(airline.code, airline)
+            self.by_name.setdefault(normalize_name(airline.name), []).append(airline)
+
+    def __len__(self):
+        return len(self.airlines)
+
+    def __iter__(self):
+        return iter(self.airlines)
+
+    def __contains__(self, code):
+        return code in self.by_code
+
+    def get(self, code, default=None):
+        return self.by_code.get(code, default)
+
+    def find_name(self, name):
+        """Compagnies portant ce nom (casse, accents et ponctuation ignorés), liste vide sinon"""
+        return self.by_name.get(normalize_name(name), [])
+
+    def as_dicts(self, limit=None):
+        return [airline.to_dict() for airline in self.airlines[:limit]]
+
+    @classmethod
+    def from_rows(cls, rows, source=None):
+        # Le cache stocke des tuples : bien plus rapides à désérialiser que des objets
+        return cls([Airline(*row) for row in rows], source)
+
+    @classmethod
+    def load(cls, csv_path=DEFAULT_CSV, use_cache=True):
+        """Catalogue du CSV, depuis le cache binaire s'il correspond encore au fichier"""
+        csv_path = os.path.abspath(csv_path)
+        stat = os.stat(csv_path)
+        pickle_path = cache_path(csv_path)
+        state = None
+        if use_cache and os.path.exists(pickle_path):
+            try:
+                with open(pickle_path, 'rb') as f:
+                    state = pickle.load(f)
+            except Exception as e:
+                print(f"[CATALOG] Cache illisible ({e}), nouvelle analyse du CSV")
+                state = None
+            if state is not None and state.get('version') != CACHE_VERSION:
+                state = None
+
+        if state is not None:
+            if (state['mtime_ns'], state['size']) == (stat.st_mtime_ns, stat.st_size):
+                return cls.from_rows(state['rows'], csv_path)
+            # Date modifiée (copie, checkout git) : le contenu est peut-être identique
+            sha256 = file_sha256(csv_path)
+            if sha256 == state['sha256']:
+                state.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                cls._save(pickle_path, state)
+                return cls.from_rows(state['rows'], csv_path)
+        else:
+            sha256 = file_sha256(csv_path)
+
+        airlines = parse_catalog_csv(csv_path)
+        if use_cache:
+            cls._save(pickle_path, {'version': CACHE_VERSION, 'mtime_ns': stat.st_mtime_ns,
+                                    'size': stat.st_size, 'sha256': sha256,
+                                    'rows': [astuple(airline) for airline in airlines]})
+        return cls(airlines, csv_path)
+
+    @staticmethod
+    def _save(pickle_path, state):
+        tmp_path = pickle_path + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, pickle_path)
+        except OSError as e:
+            # Dossier en lecture seule : le catalogue reste utilisable sans cache
+            print(f"[CATALOG] Impossible d'écrire le cache {pickle_path}: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Catalogue des compagnies FlightRadar24 (avec cache binaire)")
+    parser.add_argument('csv', nargs='?', default=DEFAULT_CSV)
+    parser.add_argument('--code', help="Compagnie à afficher, par code FlightRadar24")
+    parser.add_argument('--name', help="Compagnie(s) à afficher, par nom")
+    args = parser.parse_args()
+
+    catalog = AirlineCatalog.load(args.csv)
+    print(f"{len(catalog)} compagnies ({len(catalog.by_code)} codes distincts)")
+    matches = []
+    if args.code:
+        matches += [catalog.get(args.code)] if args.code in catalog else []
+    if args.name:
+        matches += catalog.find_name(args.name)
+    for airline in matches:
+        print(f"{airline.code:<12} {airline.name:<30} {airline.sigle:<15} {airline.aircraft_count}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Version Parquet (colonnes encodées en dictionnaire) des CSV de flotte
+
+Chaque CSV peut avoir un fichier jumeau `.parquet` au même endroit. Les
+chargeurs passent par read_table(), qui lit le Parquet s'il existe et n'est
+pas plus ancien que le CSV, et retombe sur le CSV sinon (pyarrow absent,
+Parquet manquant ou périmé).
+
+Usage :
+    python src/utils/columnar.py data/processed/fleet_data_2800.csv [--bench]
+"""
+
+import argparse
+import os
+import time
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+except ImportError:
+    pyarrow = None
+
+PYARROW_MISSING = "[PARQUET] pyarrow non installé, pas de version Parquet (pip install pyarrow)"
+
+
+def parquet_path(csv_path):
+    """Chemin du Parquet jumeau d'un CSV (fleet.csv -> fleet.parquet)"""
+    root, ext = os.path.splitext(csv_path)
+    if ext == '.gz':
+        root = os.path.splitext(root)[0]
+    return root + '.parquet'
+
+
+def has_fresh_parquet(csv_path):
+    """Vrai si le Parquet jumeau existe et n'est pas plus ancien que le CSV"""
+    path = parquet_path(csv_path)
+    if pyarrow is None or not os.path.exists(path):
+        return False
+    return not os.path.exists(csv_path) or os.path.getmtime(path) >= os.path.getmtime(csv_path)
+
+
+def write_parquet(df, csv_path):
+    """Écrit le Parquet jumeau d'un DataFrame déjà sauvegardé en CSV"""
+    if pyarrow is None:
+        print(PYARROW_MISSING)
+        return None
+    path = parquet_path(csv_path)
+    # Les colonnes texte répétées (compagnie, sigle, type...) sont encodées en dictionnaire
+    df.to_parquet(path, engine='pyarrow', compression='zstd', index=False, use_dictionary=True)
+    return path
+
+
+def write_sidecar(csv_path):
+    """Génère le Parquet jumeau d'un CSV existant, lu avec les mêmes règles que pd.read_csv"""
+    if pyarrow is None:
+        print(PYARROW_MISSING)
+        return None
+    path = write_parquet(pd.read_csv(csv_path), csv_path)
+    print(f"[PARQUET] {path} ({os.path.getsize(path) / 1024:.0f} Ko, CSV {os.path.getsize(csv_path) / 1024:.0f} Ko)")
+    return path
+
+
+def read_table(csv_path, columns=None):
+    """Charge un CSV de flotte, via son Parquet jumeau quand il est à jour"""
+    if has_fresh_parquet(csv_path):
+        return pd.read_parquet(parquet_path(csv_path), engine='pyarrow', columns=columns)
+    return pd.read_csv(csv_path, usecols=columns)
+
+
+def bench(csv_path, repeat=3):
+    """Compare taille et temps de chargement CSV / Parquet"""
+    path = parquet_path(csv_path)
+    for label, load in (('csv', lambda: pd.read_csv(csv_path)),
+                        ('parquet', lambda: pd.read_parquet(path, engine='pyarrow'))):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            df = load()
+        elapsed = (time.perf_counter() - start) / repeat
+        size = os.path.getsize(csv_path if label == 'csv' else path)
+        memory = df.memory_usage(deep=True).sum()
+        print(f"{label:<8} {size / 1024:>10.0f} Ko  {elapsed * 1000:>8.1f} ms  {memory / 1024 ** 2:>8.1f} Mo en mémoire")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère la version Parquet de CSV de flotte")
+    parser.add_argument('csv_files', nargs='+')
+    parser.add_argument('--bench', action='store_true', help="Compare taille et temps de chargement")
+    args = parser.parse_args()
+    for csv_path in args.csv_files:
+        if write_sidecar(csv_path) and args.bench:
+            bench(csv_path)
+
+
+if __name__ == '__main__':
+    main()
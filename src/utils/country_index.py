@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Index compilé des préfixes d'immatriculation -> pays (data/exports/immat.csv)
+
+Les préfixes sont rangés par longueur dans des tables de hachage. La
+résolution par lot (resolve) travaille sur une colonne entière, pandas ou
+Arrow : les immatriculations sont d'abord dédupliquées (factorize), puis
+chaque longueur de préfixe, de la plus longue à la plus courte, est
+appliquée en une seule passe vectorisée sur celles qui restent à résoudre.
+Le préfixe le plus long l'emporte, comme dans pays.find_country.
+Avec pyarrow, tout se fait en kernels Arrow ; sinon en pandas.
+
+Usage :
+    python src/utils/country_index.py data/exports/immat.csv --bench 1000000
+"""
+
+import argparse
+import random
+import string
+import time
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+
+class CountryPrefixIndex:
+    """Préfixe d'immatriculation le plus long -> pays"""
+
+    def __init__(self, mapping):
+        self.mapping = dict(mapping)
+        # {longueur: {préfixe: pays}}, des plus longs aux plus courts
+        self.tables = {}
+        for prefix, country in self.mapping.items():
+            self.tables.setdefault(len(prefix), {})[prefix] = country
+        self.lengths = sorted(self.tables, reverse=True)
+
+    def lookup(self, registration):
+        """Pays d'une immatriculation ('' si aucun préfixe ne correspond)"""
+        registration = str(registration).strip().upper()
+        for length in self.lengths:
+            country = self.tables[length].get(registration[:length])
+            if country is not None:
+                return country
+        return ''
+
+    def resolve(self, registrations):
+        """Pays de chaque immatriculation d'une colonne (Series, liste, array ou colonne Arrow).
+
+        Renvoie une Series de chaînes ('' si aucun préfixe, ou valeur manquante)
+        alignée sur l'index de l'entrée.
+        """
+        index = registrations.index if isinstance(registrations, pd.Series) else None
+        if pa is not None:
+            countries = self._resolve_arrow(registrations)
+        else:
+            countries = self._resolve_pandas(pd.Series(registrations, dtype=object))
+        return pd.Series(countries, index=index, dtype=object)
+
+    def _arrow_tables(self):
+        if not hasattr(self, '_arrow'):
+            self._arrow = [(length, pa.array(list(table), pa.string()), pa.array(list(table.values()), pa.string()))
+                           for length, table in ((length, self.tables[length]) for length in self.lengths)]
+        return self._arrow
+
+    def _resolve_arrow(self, registrations):
+        if isinstance(registrations, pa.ChunkedArray):
+            registrations = registrations.combine_chunks()
+        elif not isinstance(registrations, pa.Array):
+            registrations = pd.Series(registrations, dtype=object)
+            try:
+                registrations = pa.array(registrations, type=pa.string(), from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # Valeurs non textuelles mêlées aux immatriculations : ignorées, comme dans pays.py
+                registrations = pa.array(registrations.where(registrations.map(type) == str),
+                                         type=pa.string(), from_pandas=True)
+        normalized = pc.utf8_upper(pc.utf8_trim_whitespace(registrations.cast(pa.string())))
+        encoded = pc.dictionary_encode(normalized)
+        uniques = encoded.dictionary
+        countries = pa.nulls(len(uniques), pa.string())
+        for length, prefixes, values in self._arrow_tables():
+            # coalesce garde le pays déjà trouvé avec un préfixe plus long
+            positions = pc.index_in(pc.utf8_slice_codeunits(uniques, 0, length), value_set=prefixes)
+            countries = pc.coalesce(countries, pc.take(values, positions))
+        countries = pc.fill_null(pc.take(countries, encoded.indices), '')
+        return countries.to_numpy(zero_copy_only=False)
+
+    def _resolve_pandas(self, registrations):
+        # Valeurs non textuelles (NaN...) -> NaN -> ''
+        normalized = registrations.str.strip().str.upper().fillna('')
+        codes, uniques = pd.factorize(normalized, sort=False)
+        uniques = pd.Series(uniques, dtype=object)
+        countries = np.full(len(uniques), '', dtype=object)
+        pending = np.flatnonzero(uniques.str.len().to_numpy() > 0)
+        for length in self.lengths:
+            if not len(pending):
+                break
+            found = uniques.iloc[pending].str[:length].map(self.tables[length])
+            hits = found.notna().to_numpy()
+            countries[pending[hits]] = found.to_numpy()[hits]
+            pending = pending[~hits]
+        return countries[codes]
+
+
+def synthetic_registrations(index, n, seed=0):
+    """n immatriculations plausibles : préfixes connus + suffixes aléatoires (avec répétitions)"""
+    rng = random.Random(seed)
+    prefixes = list(index.mapping) or ['N']
+    alphabet = string.ascii_uppercase + string.digits
+    pool = [rng.choice(prefixes) + ''.join(rng.choices(alphabet, k=rng.randint(2, 5)))
+            for _ in range(max(1, n // 3))]
+    # Les snapshots historiques répètent les mêmes aircraft d'un run à l'autre
+    return pd.Series(rng.choices(pool, k=n), dtype=object)
+
+
+def bench(index, n, find_country):
+    """Compare find_country (référence ligne à ligne) et resolve sur n immatriculations"""
+    registrations = synthetic_registrations(index, n)
+    print(f"{n} immatriculations ({registrations.nunique()} distinctes), {len(index.mapping)} préfixes")
+
+    start = time.perf_counter()
+    expected = [find_country(reg, index.mapping) if isinstance(reg, str) and reg.strip() else ''
+                for reg in registrations]
+    row_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    resolved = index.resolve(registrations)
+    batch_time = time.perf_counter() - start
+
+    print(f"find_country ligne à ligne : {row_time:7.2f} s")
+    print(f"résolution par lot         : {batch_time:7.2f} s ({row_time / batch_time:.1f}x)")
+    print(f"Résultats identiques : {'OK' if resolved.tolist() == expected else 'ÉCHEC'}")
+
+
+def main():
+    # pays importe ce module : import local pour éviter un import circulaire
+    from pays import find_country, load_immat_mapping
+
+    parser = argparse.ArgumentParser(description="Index des préfixes d'immatriculation -> pays")
+    parser.add_argument('immat', help="Table des préfixes (data/exports/immat.csv)")
+    parser.add_argument('registrations', nargs='*', help="Immatriculations à résoudre")
+    parser.add_argument('--bench', type=int, default=None, metavar='N',
+                        help="Compare find_country et la résolution par lot sur N immatriculations")
+    args = parser.parse_args()
+
+    index = CountryPrefixIndex(load_immat_mapping(args.immat))
+    for registration in args.registrations:
+        print(f"{registration}: {index.lookup(registration) or '-'}")
+    if args.bench:
+        bench(index, args.bench, find_country)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,8 @@
 import csv
 
+from fuzzy_join import DEFAULT_THRESHOLD, FuzzyIndex
+from name_normalizer import normalize_name
+
 # Fichiers d'entrée
 FLEET_CSV = '../../data/processed/fleet_data_2800_with_country.csv'
 LINKEDIN_CSV = '../../data/raw/linkedin_list/linkedin_list_merged_with_fleet.csv'
@@ -15,15 +18,29 @@ with open(FLEET_CSV, encoding='utf-8') as f:
         if name and country:
             fleet_countries[name] = country
 
-# Lire linkedin_list et ajouter la colonne country
-with open(LINKEDIN_CSV, encoding='utf-8') as f_in, open(OUTPUT_CSV, 'w', encoding='utf-8', newline='') as f_out:
+# Lire linkedin_list
+with open(LINKEDIN_CSV, encoding='utf-8') as f_in:
     reader = csv.DictReader(f_in)
     fieldnames = reader.fieldnames + ['country']
+    rows = list(reader)
+
+# Compagnies absentes telles quelles de fleet_data : rapprochement approché sur le nom normalisé
+countries_by_norm = {normalize_name(name): country for name, country in fleet_countries.items()}
+unknown = {row['company_name'].strip() for row in rows} - set(fleet_countries)
+fuzzy = FuzzyIndex(countries_by_norm).match(sorted(unknown), DEFAULT_THRESHOLD)
+fuzzy = fuzzy[fuzzy['match'].notna()]
+for name, match, score in zip(fuzzy['name'], fuzzy['match'], fuzzy['score']):
+    fleet_countries[name] = countries_by_norm[match]
+    print(f"[FUZZY] {name!r} -> {match!r} ({score:.2f})")
+
+# Ajouter la colonne country
+with open(OUTPUT_CSV, 'w', encoding='utf-8', newline='') as f_out:
     writer = csv.DictWriter(f_out, fieldnames=fieldnames)
     writer.writeheader()
-    for row in reader:
+    for row in rows:
         company = row['company_name'].strip()
         row['country'] = fleet_countries.get(company, '')
         writer.writerow(row)
 
 print(f"Fichier créé : {OUTPUT_CSV}")
+print(f"Pays trouvés par rapprochement approché : {len(fuzzy)} compagnies")
@@ -1,4 +1,5 @@
 import csv
+import sys
 from collections import defaultdict
 
 def check_fleet_size(linkedin_file, fleet_file):
@@ -56,4 +57,7 @@ def check_fleet_size(linkedin_file, fleet_file):
 if __name__ == "__main__":
     linkedin_file = "src/interface/auth-material-ui/public/linkedin_list_merged_with_fleet.csv"
     fleet_file = "src/interface/auth-material-ui/public/fleet_data_2800.csv"
+    # Autres fichiers en arguments (utilisé par pipeline.py) : python fixer.py LINKEDIN_CSV FLEET_CSV
+    if len(sys.argv) == 3:
+        linkedin_file, fleet_file = sys.argv[1:3]
     check_fleet_size(linkedin_file, fleet_file)
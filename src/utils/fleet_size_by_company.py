@@ -1,6 +1,8 @@
-import pandas as pd
 import os
 
+from columnar import read_table, write_parquet
+from name_normalizer import normalize_names
+
 
 # Chemin absolu du fichier source
 base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../data/processed'))
@@ -9,21 +11,10 @@ output_path = os.path.join(base_dir, 'fleet_size_by_company.csv')
 
 # Charger le fichier aircraft
 print(f"Lecture : {aircraft_path}")
-df = pd.read_csv(aircraft_path)
-
-# Normaliser le nom de la compagnie
-import unicodedata
-import re
-def normalize(s):
-    if pd.isna(s):
-        return ''
-    s = str(s).strip().lower()
-    s = ''.join(c for c in unicodedata.normalize('NFD', s) if unicodedata.category(c) != 'Mn')
-    s = re.sub(r'[^a-z0-9 ]', '', s)
-    s = re.sub(r'\s+', ' ', s)
-    return s.strip()
+df = read_table(aircraft_path)
 
-df['airline_name_norm'] = df['airline_name'].apply(normalize)
+# Normaliser le nom de la compagnie (noms distincts normalisés une seule fois)
+df['airline_name_norm'] = normalize_names(df['airline_name'])
 
 
 # Diagnostic : combien de compagnies uniques dans le fichier ?
@@ -37,5 +28,6 @@ result['fleet_size'] = result['fleet_size'].astype(int)
 
 # Sauvegarder le résultat (seulement nom normalisé et taille de flotte)
 result.to_csv(output_path, index=False)
+write_parquet(result, output_path)
 print(f"Fichier créé : {output_path}")
 print(f"Nombre de compagnies uniques : {result.shape[0]}")
@@ -1,20 +1,8 @@
-
-def normalize(s):
-    if pd.isna(s):
-        return ''
-    s = str(s).strip().lower()
-    # Supprimer les accents
-    s = ''.join(c for c in unicodedata.normalize('NFD', s) if unicodedata.category(c) != 'Mn')
-    # Supprimer caractères spéciaux sauf lettres, chiffres et espaces
-    s = re.sub(r'[^a-z0-9 ]', '', s)
-    # Remplacer espaces multiples par un seul
-    s = re.sub(r'\s+', ' ', s)
-    return s.strip()
-
 import pandas as pd
 import os
-import unicodedata
-import re
+
+from fuzzy_join import DEFAULT_THRESHOLD, FuzzyIndex
+from name_normalizer import normalize_names
 
 # Chemins absolus depuis ce script
 base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../data/raw'))
@@ -26,19 +14,17 @@ output_path = os.path.join(base_dir, 'linkedin_list', 'linkedin_list_merged_with
 linkedin_df = pd.read_csv(linkedin_path)
 fleet_df = pd.read_csv(fleet_path)
 
-# Fonction de normalisation
-def normalize(s):
-    if pd.isna(s):
-        return ''
-    s = str(s).strip().lower()
-    s = ''.join(c for c in unicodedata.normalize('NFD', s) if unicodedata.category(c) != 'Mn')
-    s = re.sub(r'[^a-z0-9 ]', '', s)
-    s = re.sub(r'\s+', ' ', s)
-    return s.strip()
-
 # Ajouter la colonne normalisée pour le merge
-linkedin_df['company_name_norm'] = linkedin_df['company_name'].apply(normalize)
+linkedin_df['company_name_norm'] = normalize_names(linkedin_df['company_name'])
 
+# Noms sans correspondance exacte : rapprochement approché (fautes, mots inversés, Ltd...)
+unmatched = ~linkedin_df['company_name_norm'].isin(set(fleet_df['airline_name_norm']))
+fuzzy = FuzzyIndex(fleet_df['airline_name_norm']).match(linkedin_df.loc[unmatched, 'company_name'], DEFAULT_THRESHOLD)
+fuzzy = fuzzy[fuzzy['match'].notna()]
+for row in fuzzy.itertuples():
+    print(f"[FUZZY] {row.name!r} -> {row.match!r} ({row.score:.2f})")
+fuzzy_norm = linkedin_df['company_name'].map(dict(zip(fuzzy['name'], fuzzy['match'])))
+linkedin_df['company_name_norm'] = fuzzy_norm.fillna(linkedin_df['company_name_norm'])
 
 # Fusionner sur le nom normalisé
 merged = pd.merge(linkedin_df, fleet_df, left_on='company_name_norm', right_on='airline_name_norm', how='left')
@@ -54,4 +40,6 @@ merged['fleet_size'] = merged['fleet_size'].fillna(0).astype(int)
 # Exporter le résultat
 merged.to_csv(output_path, index=False)
 print(f"Fichier créé : {output_path}")
+print(f"Rapprochements approchés (score >= {DEFAULT_THRESHOLD}) : {len(fuzzy)} / {unmatched.sum()} "
+      f"lignes sans correspondance exacte")
 print(f"Nombre de compagnies avec fleet_size renseigné : {merged['fleet_size'].notna().sum()}")
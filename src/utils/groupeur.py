@@ -1,24 +1,179 @@
+"""
+Fusion des classeurs LinkedIn (data/raw/linkedin_list/1.xlsx, 2.xlsx...) en linkedin_list_merged.csv
+
+Les feuilles lues sont gardées dans data/cache/groupeur (Parquet), par
+classeur : un classeur dont la date et la taille, ou à défaut l'empreinte
+SHA-256, n'ont pas changé n'est pas relu. Les autres sont lus en parallèle,
+un processus par classeur. Les verrous d'Excel (~$1.xlsx) sont ignorés.
+
+Usage :
+    python src/utils/groupeur.py              # ne relit que les classeurs nouveaux ou modifiés
+    python src/utils/groupeur.py --no-cache   # relit tout
+"""
+
+import argparse
+import hashlib
+import json
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 
-def main():
-    base_dir = os.path.join(os.path.dirname(__file__), '../../data/raw/linkedin_list')
-    all_dfs = []
-    for i in range(1, 30):
-        file_path = os.path.join(base_dir, f"{i}.xlsx")
-        if os.path.exists(file_path):
+try:
+    import pyarrow  # noqa: F401
+except ImportError:
+    pyarrow = None
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), '../../data/raw/linkedin_list')
+# Feuilles déjà lues, une par fichier (Parquet, ou pickle si Parquet impossible)
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '../../data/cache/groupeur')
+# Classeurs numérotés : 1.xlsx, 2.xlsx... (pas les verrous d'Excel ~$1.xlsx)
+WORKBOOK_NAME = re.compile(r'^(\d+)\.xlsx$')
+
+
+def list_workbooks(base_dir):
+    """Classeurs à fusionner, dans l'ordre de leur numéro"""
+    names = [name for name in os.listdir(base_dir) if WORKBOOK_NAME.match(name)]
+    names.sort(key=lambda name: int(WORKBOOK_NAME.match(name).group(1)))
+    return [os.path.join(base_dir, name) for name in names]
+
+
+def file_sha256(path):
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def read_workbook(file_path):
+    """[(feuille, DataFrame)] d'un classeur (exécuté dans un processus du pool)"""
+    xls = pd.ExcelFile(file_path)
+    return [(sheet_name, pd.read_excel(xls, sheet_name=sheet_name)) for sheet_name in xls.sheet_names]
+
+
+class SheetCache:
+    """Feuilles déjà lues, valides tant que date et taille (ou à défaut SHA-256) du classeur sont inchangées"""
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding='utf-8') as f:
+                self.index = json.load(f)
+
+    def lookup(self, file_path):
+        """Feuilles en cache du classeur, ou None s'il a changé"""
+        entry = self.index.get(os.path.basename(file_path))
+        if entry is None:
+            return None
+        stat = os.stat(file_path)
+        if [entry['mtime_ns'], entry['size']] != [stat.st_mtime_ns, stat.st_size]:
+            # Date changée (copie, checkout...) : le contenu peut être le même
+            if entry['sha256'] != file_sha256(file_path):
+                return None
+            entry['mtime_ns'], entry['size'] = stat.st_mtime_ns, stat.st_size
+        try:
+            return [(sheet_name, self.load(name)) for sheet_name, name in entry['sheets']]
+        except (OSError, ValueError) as e:
+            print(f"[CACHE] {file_path} : cache illisible ({e}), relecture")
+            return None
+
+    def load(self, name):
+        path = os.path.join(self.cache_dir, name)
+        if name.endswith('.parquet'):
+            return pd.read_parquet(path, engine='pyarrow')
+        return pd.read_pickle(path)
+
+    def store(self, file_path, sheets):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        key = os.path.basename(file_path)
+        stat = os.stat(file_path)
+        sha256 = file_sha256(file_path)
+        self.remove(key)
+        names = []
+        for i, (sheet_name, df) in enumerate(sheets):
+            names.append([sheet_name, self.write(df, f"{os.path.splitext(key)[0]}_{sha256[:16]}_{i}")])
+        self.index[key] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': sha256, 'sheets': names}
+
+    def write(self, df, name):
+        """Écrit une feuille, en Parquet si possible ; renvoie le nom du fichier"""
+        # Parquet n'a que des en-têtes texte : une feuille sans en-tête (colonnes 0, 1...)
+        # reviendrait avec '0', '1'..., et pd.concat n'alignerait plus pareil
+        if pyarrow is not None and all(isinstance(column, str) for column in df.columns):
+            path = os.path.join(self.cache_dir, name + '.parquet')
             try:
-                xls = pd.ExcelFile(file_path)
-                for sheet_name in xls.sheet_names:
-                    df = pd.read_excel(xls, sheet_name=sheet_name)
-                    print(f"{file_path} - Feuille: {sheet_name} - Lignes lues: {len(df)}")
-                    if df.empty:
-                        print(f"ATTENTION: {file_path} - {sheet_name} est vide.")
-                    all_dfs.append(df)
-            except Exception as e:
-                print(f"Erreur lors de la lecture de {file_path}: {e}")
+                df.to_parquet(path, engine='pyarrow', index=False)
+                return name + '.parquet'
+            except (ValueError, TypeError, pyarrow.lib.ArrowException):
+                # Colonne de types mêlés ou en-têtes en double : pickle, qui garde tout tel quel
+                if os.path.exists(path):
+                    os.remove(path)
+        df.to_pickle(os.path.join(self.cache_dir, name + '.pickle'))
+        return name + '.pickle'
+
+    def remove(self, key):
+        for _, name in self.index.pop(key, {}).get('sheets', []):
+            path = os.path.join(self.cache_dir, name)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def save(self, keep):
+        """Écrit l'index, en oubliant les classeurs qui ne sont plus dans `keep`"""
+        for key in set(self.index) - {os.path.basename(path) for path in keep}:
+            self.remove(key)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+
+def load_workbooks(file_paths, cache=None, workers=None):
+    """{classeur: [(feuille, DataFrame)]} ; seuls les classeurs absents du cache sont relus, en parallèle"""
+    sheets = {}
+    todo = []
+    for file_path in file_paths:
+        cached = cache.lookup(file_path) if cache is not None else None
+        if cached is None:
+            todo.append(file_path)
         else:
-            print(f"Fichier non trouvé: {file_path}")
+            sheets[file_path] = cached
+    print(f"[CACHE] {len(sheets)} classeur(s) en cache, {len(todo)} à lire")
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {file_path: executor.submit(read_workbook, file_path) for file_path in todo}
+            for file_path, future in futures.items():
+                try:
+                    sheets[file_path] = future.result()
+                except Exception as e:
+                    print(f"Erreur lors de la lecture de {file_path}: {e}")
+                    continue
+                if cache is not None:
+                    cache.store(file_path, sheets[file_path])
+    if cache is not None:
+        cache.save(file_paths)
+    return sheets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fusion des classeurs LinkedIn (1.xlsx, 2.xlsx...)")
+    parser.add_argument('--no-cache', action='store_true', help="Relit tous les classeurs sans utiliser le cache")
+    parser.add_argument('--workers', type=int, default=None, help="Processus de lecture (défaut : nombre de CPU)")
+    args = parser.parse_args()
+
+    base_dir = BASE_DIR
+    file_paths = list_workbooks(base_dir)
+    sheets = load_workbooks(file_paths, cache=None if args.no_cache else SheetCache(), workers=args.workers)
+    all_dfs = []
+    for file_path in file_paths:
+        for sheet_name, df in sheets.get(file_path, []):
+            print(f"{file_path} - Feuille: {sheet_name} - Lignes lues: {len(df)}")
+            if df.empty:
+                print(f"ATTENTION: {file_path} - {sheet_name} est vide.")
+            all_dfs.append(df)
     if all_dfs:
         merged_df = pd.concat(all_dfs, ignore_index=True)
         print(f"Nombre de colonnes détecté: {len(merged_df.columns)}")
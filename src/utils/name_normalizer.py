@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Normalisation des noms de compagnie pour les jointures et regroupements
+
+"Aérolíneas  Argentinas S.A." -> "aerolineas argentinas sa" : minuscules,
+accents retirés (NFD), tout caractère hors [a-z0-9 ] supprimé, espaces
+multiples réduits. Après NFD, les accents sont des caractères combinants
+non ASCII : le filtre [a-z0-9 ] les retire avec le reste.
+
+- normalize_name(nom) : un nom, mémoïsé (LRU) pour les noms répétés
+- normalize_names(colonne) : colonne entière (Series, liste, colonne Arrow) ;
+  les noms distincts sont normalisés une seule fois, en opérations .str vectorisées
+
+Usage :
+    python src/utils/name_normalizer.py --bench 500000
+"""
+
+import argparse
+import random
+import re
+import time
+import unicodedata
+from functools import lru_cache
+
+NON_NAME_CHARS = re.compile(r'[^a-z0-9 ]')
+SPACES = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=65536)
+def _normalize(name):
+    name = unicodedata.normalize('NFD', name.strip().lower())
+    name = NON_NAME_CHARS.sub('', name)
+    return SPACES.sub(' ', name).strip()
+
+
+def normalize_name(name):
+    """Nom normalisé ('' pour une valeur manquante)"""
+    if name is None:
+        return ''
+    if not isinstance(name, str):
+        # pandas seulement pour les valeurs non textuelles : le catalogue du scraper
+        # (que des chaînes) n'a pas à le charger
+        import pandas as pd
+        if pd.isna(name):
+            return ''
+    return _normalize(str(name))
+
+
+def normalize_names(names):
+    """Noms normalisés d'une colonne, en Series alignée sur l'entrée ('' pour les valeurs manquantes)"""
+    import pandas as pd
+    if hasattr(names, 'to_pandas'):
+        names = names.to_pandas()
+    index = names.index if isinstance(names, pd.Series) else None
+    names = pd.Series(names, index=index, dtype=object)
+    codes, uniques = pd.factorize(names, sort=False)
+    uniques = pd.Series(uniques, dtype=object).astype(str)
+    normalized = (uniques.str.strip().str.lower().str.normalize('NFD')
+                  .str.replace(NON_NAME_CHARS, '', regex=True)
+                  .str.replace(SPACES, ' ', regex=True).str.strip())
+    # Code -1 : valeur manquante
+    values = normalized.to_numpy(dtype=object)[codes]
+    values[codes < 0] = ''
+    return pd.Series(values, index=names.index, dtype=object)
+
+
+def bench(n):
+    """Compare Series.apply(normalize_name) et normalize_names sur n noms (avec répétitions)"""
+    import pandas as pd
+    rng = random.Random(0)
+    words = ['Aérolíneas', 'Air', 'Société', 'Çargo', 'Express', 'Líneas', 'Aéreas', 'Jet', 'Ñandú', 'Sky',
+             'Tours', 'S.A.', 'GmbH', '& Co', 'Øresund', 'Wings']
+    pool = [' '.join(rng.choices(words, k=rng.randint(1, 4))) + f" {rng.randint(0, 999)}"
+            for _ in range(max(1, n // 20))]
+    names = pd.Series(rng.choices(pool, k=n), dtype=object)
+    print(f"{n} noms ({names.nunique()} distincts)")
+
+    start = time.perf_counter()
+    expected = names.apply(lambda name: _normalize.__wrapped__(name))
+    apply_time = time.perf_counter() - start
+    start = time.perf_counter()
+    result = normalize_names(names)
+    batch_time = time.perf_counter() - start
+
+    print(f"Series.apply (sans mémo) : {apply_time:6.2f} s")
+    print(f"normalize_names          : {batch_time:6.2f} s ({apply_time / batch_time:.1f}x)")
+    print(f"Résultats identiques : {'OK' if result.tolist() == expected.tolist() else 'ÉCHEC'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Normalisation des noms de compagnie")
+    parser.add_argument('names', nargs='*', help="Noms à normaliser")
+    parser.add_argument('--bench', type=int, default=None, metavar='N')
+    args = parser.parse_args()
+    for name in args.names:
+        print(f"{name!r} -> {normalize_name(name)!r}")
+    if args.bench:
+        bench(args.bench)
+
+
+if __name__ == '__main__':
+    main()
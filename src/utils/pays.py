@@ -1,6 +1,9 @@
 import csv
 import os
 
+from columnar import read_table, write_parquet
+from country_index import CountryPrefixIndex
+
 def load_immat_mapping(immat_path):
     mapping = {}
     with open(immat_path, encoding='utf-8') as f:
@@ -22,17 +25,13 @@ def find_country(registration, mapping):
     return ''
 
 def add_country_to_fleet_data(fleet_path, immat_path, output_path):
-    mapping = load_immat_mapping(immat_path)
-    with open(fleet_path, encoding='utf-8') as fin, open(output_path, 'w', newline='', encoding='utf-8') as fout:
-        reader = csv.DictReader(fin)
-        fieldnames = reader.fieldnames + ['country']
-        writer = csv.DictWriter(fout, fieldnames=fieldnames)
-        writer.writeheader()
-        for row in reader:
-            reg = row.get('registration', '').strip()
-            country = find_country(reg, mapping) if reg else ''
-            row['country'] = country
-            writer.writerow(row)
+    index = CountryPrefixIndex(load_immat_mapping(immat_path))
+    # Lecture via la version Parquet si elle est à jour
+    df = read_table(fleet_path)
+    # Toute la colonne en une fois (préfixe le plus long, comme find_country)
+    df['country'] = index.resolve(df['registration'])
+    df.to_csv(output_path, index=False, lineterminator='\r\n')
+    write_parquet(df, output_path)
 
 if __name__ == '__main__':
     base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
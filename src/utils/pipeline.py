@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Pipeline des exports LinkedIn / flotte (scripts de src/utils)
+
+Les scripts sont déclarés comme étapes avec leurs entrées et sorties :
+
+    groupeur -> fleet_size_by_company -> fusion -> fixer -> pays -> countrylink -> lil_airliner
+
+Une étape n'est relancée que si le contenu (SHA-256) d'une de ses entrées,
+de son script, ou d'une de ses sorties a changé depuis son dernier succès.
+Les étapes indépendantes (ex. groupeur, fleet_size_by_company et pays)
+tournent en parallèle, chacune dans son propre processus.
+
+Usage :
+    python src/utils/pipeline.py                 # ne relance que ce qui est périmé
+    python src/utils/pipeline.py --dry-run       # affiche le plan sans rien exécuter
+    python src/utils/pipeline.py --force fusion  # force une étape (et donc celles qui en dépendent)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+UTILS_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.abspath(os.path.join(UTILS_DIR, '..', '..'))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+STATE_PATH = os.path.join(DATA_DIR, 'cache', 'pipeline_state.json')
+
+
+def data(*parts):
+    return os.path.join(DATA_DIR, *parts)
+
+
+def util(name):
+    """Module partagé importé par un script : à déclarer en entrée de l'étape"""
+    return os.path.join(UTILS_DIR, name)
+
+
+class Stage:
+    """Un script de src/utils, lancé depuis src/utils (certains utilisent des chemins relatifs)"""
+
+    def __init__(self, name, script, inputs, outputs, args=()):
+        self.name = name
+        self.script = os.path.join(UTILS_DIR, script)
+        # Le script fait partie des entrées : le modifier relance l'étape
+        self.inputs = [self.script] + list(inputs)
+        self.outputs = list(outputs)
+        self.args = [str(arg) for arg in args]
+        self.deps = set()
+
+    def run(self):
+        return subprocess.run([sys.executable, self.script] + self.args, cwd=UTILS_DIR,
+                              capture_output=True, text=True, encoding='utf-8', errors='replace')
+
+
+def default_stages():
+    linkedin_dir = data('raw', 'linkedin_list')
+    merged = os.path.join(linkedin_dir, 'linkedin_list_merged.csv')
+    with_fleet = os.path.join(linkedin_dir, 'linkedin_list_merged_with_fleet.csv')
+    fleet_data = data('processed', 'fleet_data_2800.csv')
+    fleet_size = data('processed', 'fleet_size_by_company.csv')
+    with_country = data('processed', 'fleet_data_2800_with_country.csv')
+    # Classeurs numérotés, comme groupeur.list_workbooks (sans les verrous ~$1.xlsx)
+    xlsx_files = sorted(os.path.join(linkedin_dir, name) for name in os.listdir(linkedin_dir)
+                        if name.endswith('.xlsx') and name[:-5].isdigit())
+    return [
+        Stage('groupeur', 'groupeur.py', xlsx_files, [merged]),
+        Stage('fleet_size_by_company', 'fleet_size_by_company.py',
+              [fleet_data, util('name_normalizer.py'), util('columnar.py')],
+              [fleet_size]),
+        Stage('fusion', 'fusion.py', [merged, fleet_size, util('name_normalizer.py'), util('fuzzy_join.py')],
+              [with_fleet]),
+        # Corrige with_fleet sur place
+        Stage('fixer', 'fixer.py', [with_fleet, fleet_data], [with_fleet], args=[with_fleet, fleet_data]),
+        Stage('pays', 'pays.py',
+              [fleet_data, data('exports', 'immat.csv'), util('country_index.py'), util('columnar.py')],
+              [with_country]),
+        Stage('countrylink', 'countrylink.py',
+              [with_country, with_fleet, util('name_normalizer.py'), util('fuzzy_join.py')],
+              [os.path.join(linkedin_dir, 'linkedin_list_with_country.csv')]),
+        Stage('lil_airliner', 'lil_airliner.py', [data('raw', 'airlines_name_clean_filtered.csv'), with_fleet],
+              [data('exports', 'airlines_fleet_leq_25.csv')]),
+    ]
+
+
+def link_stages(stages):
+    """Dépendances : chaque entrée vient de la dernière étape déclarée avant qui l'écrit"""
+    producers = {}
+    for stage in stages:
+        stage.deps = {producers[path] for path in stage.inputs if path in producers}
+        for path in stage.outputs:
+            producers[path] = stage.name
+    return stages
+
+
+class FileHashes:
+    """Empreintes SHA-256, recalculées seulement si date ou taille du fichier ont changé"""
+
+    def __init__(self, known=None):
+        self.known = known or {}
+
+    def digest(self, path):
+        if not os.path.exists(path):
+            return None
+        stat = os.stat(path)
+        known = self.known.get(path)
+        if known and known[:2] == [stat.st_mtime_ns, stat.st_size]:
+            return known[2]
+        sha256 = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha256.update(chunk)
+        self.known[path] = [stat.st_mtime_ns, stat.st_size, sha256.hexdigest()]
+        return self.known[path][2]
+
+    def snapshot(self, paths):
+        return {os.path.relpath(path, BASE_DIR): self.digest(path) for path in paths}
+
+
+class Pipeline:
+    def __init__(self, stages, state_path=STATE_PATH, jobs=4):
+        self.stages = {stage.name: stage for stage in link_stages(stages)}
+        self.state_path = state_path
+        self.jobs = jobs
+        self.state = self.load_state()
+        self.hashes = FileHashes(self.state.get('files'))
+
+    def load_state(self):
+        if os.path.exists(self.state_path):
+            with open(self.state_path, encoding='utf-8') as f:
+                return json.load(f)
+        return {'stages': {}, 'files': {}}
+
+    def save_state(self):
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        self.state['files'] = self.hashes.known
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def is_fresh(self, stage):
+        """Vrai si entrées, script et sorties sont identiques au dernier succès de l'étape"""
+        previous = self.state['stages'].get(stage.name)
+        return (previous is not None
+                and previous['inputs'] == self.hashes.snapshot(stage.inputs)
+                and previous['outputs'] == self.hashes.snapshot(stage.outputs)
+                and None not in previous['outputs'].values())
+
+    def missing_inputs(self, stage):
+        return [path for path in stage.inputs if not os.path.exists(path)]
+
+    def run(self, force=(), dry_run=False):
+        """Exécute les étapes périmées ; renvoie {étape: statut}"""
+        unknown = set(force) - set(self.stages) - {'all'}
+        if unknown:
+            raise ValueError(f"Étapes inconnues : {', '.join(sorted(unknown))}")
+        status = {}
+        rerun = set()  # étapes relancées (ou à relancer) : leurs dépendantes le seront aussi
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            while len(status) < len(self.stages):
+                for name, stage in self.stages.items():
+                    if name in status or name in running or not stage.deps <= set(status):
+                        continue
+                    blocked = [dep for dep in stage.deps if status[dep] in ('échec', 'bloquée')]
+                    if blocked:
+                        status[name] = 'bloquée'
+                        print(f"[PIPELINE] {name} : bloquée ({', '.join(blocked)} en échec)")
+                        continue
+                    forced = 'all' in force or name in force or stage.deps & rerun
+                    if not forced and self.is_fresh(stage):
+                        status[name] = 'à jour'
+                        print(f"[PIPELINE] {name} : à jour")
+                        continue
+                    rerun.add(name)
+                    if dry_run:
+                        status[name] = 'à relancer'
+                        print(f"[PIPELINE] {name} : à relancer")
+                        continue
+                    missing = self.missing_inputs(stage)
+                    if missing:
+                        status[name] = 'échec'
+                        print(f"[PIPELINE] {name} : entrée(s) manquante(s) : {', '.join(missing)}")
+                        continue
+                    print(f"[PIPELINE] {name} : lancement")
+                    running[name] = (executor.submit(stage.run), time.monotonic())
+                if not running:
+                    continue
+                finished, _ = wait([future for future, _ in running.values()], return_when=FIRST_COMPLETED)
+                for name, (future, started) in list(running.items()):
+                    if future in finished:
+                        del running[name]
+                        status[name] = self.finish(self.stages[name], future.result(),
+                                                   time.monotonic() - started)
+        return status
+
+    def finish(self, stage, process, elapsed):
+        for line in (process.stdout + process.stderr).splitlines():
+            print(f"  [{stage.name}] {line}")
+        missing = [path for path in stage.outputs if not os.path.exists(path)]
+        if process.returncode != 0 or missing:
+            print(f"[PIPELINE] {stage.name} : échec (code {process.returncode}) en {elapsed:.1f}s")
+            self.state['stages'].pop(stage.name, None)
+            self.save_state()
+            return 'échec'
+        # Empreintes prises après l'exécution : une étape qui corrige un fichier
+        # sur place (fixer) est à jour tant que personne ne le modifie ensuite
+        self.state['stages'][stage.name] = {
+            'inputs': self.hashes.snapshot(stage.inputs),
+            'outputs': self.hashes.snapshot(stage.outputs),
+            'finished_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        # Les étapes en amont qui écrivent le même fichier ne sont pas périmées pour autant
+        outputs = self.state['stages'][stage.name]['outputs']
+        for other in self.stages.values():
+            previous = self.state['stages'].get(other.name)
+            if other is not stage and previous:
+                previous['outputs'].update((path, outputs[path]) for path in previous['outputs'] if path in outputs)
+        self.save_state()
+        print(f"[PIPELINE] {stage.name} : terminé en {elapsed:.1f}s")
+        return 'terminé'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline incrémental des exports LinkedIn / flotte")
+    parser.add_argument('--force', nargs='*', default=None, metavar='ÉTAPE',
+                        help="Étapes à relancer même si elles sont à jour (sans nom : toutes)")
+    parser.add_argument('--dry-run', action='store_true', help="Affiche les étapes à relancer sans les exécuter")
+    parser.add_argument('--jobs', type=int, default=4, help="Nombre d'étapes en parallèle")
+    parser.add_argument('--list', action='store_true', help="Liste les étapes, entrées et sorties")
+    args = parser.parse_args()
+
+    # --force seul : toutes les étapes
+    force = ('all',) if args.force == [] else (args.force or ())
+    pipeline = Pipeline(default_stages(), jobs=args.jobs)
+    if args.list:
+        for name, stage in pipeline.stages.items():
+            print(f"{name} (après : {', '.join(sorted(stage.deps)) or '-'})")
+            for path in stage.inputs:
+                print(f"  < {os.path.relpath(path, BASE_DIR)}")
+            for path in stage.outputs:
+                print(f"  > {os.path.relpath(path, BASE_DIR)}")
+        return
+    status = pipeline.run(force=force, dry_run=args.dry_run)
+    print(f"[PIPELINE] Résumé : {status}")
+    if any(value in ('échec', 'bloquée') for value in status.values()):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,6 @@
 import os
-import pandas as pd
+
+from columnar import read_table, write_parquet
 
 # Charger le CSV
 input_path = 'data/processed/fleet_data_2800.csv'
@@ -9,7 +10,7 @@ if not os.path.exists(input_path):
     print(f"File not found: {input_path}")
     exit(1)
 
-df = pd.read_csv(input_path)
+df = read_table(input_path)
 
 # Supprimer les colonnes 'airline_code' et 'status' si elles existent
 cols_to_remove = [col for col in ['airline_code', 'status'] if col in df.columns]
@@ -17,4 +18,5 @@ df = df.drop(columns=cols_to_remove)
 
 # Sauvegarder le nouveau CSV
 df.to_csv(output_path, index=False)
+write_parquet(df, output_path)
 print(f"Fichier nettoyé sauvegardé dans {output_path}")
@@ -1,6 +1,12 @@
+import os
+import sys
+
 import streamlit as st
 import pandas as pd
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'utils'))
+from columnar import read_table
+
 st.set_page_config(page_title="Visualisation Flotte Aérienne", layout="wide")
 
 st.title("Visualisation des Données Aériennes")
@@ -12,7 +18,8 @@ linkedin_csv_path = 'data/raw/linkedin_list/linkedin_list_merged_with_fleet.csv'
 
 def load_data(path):
     try:
-        df = pd.read_csv(path)
+        # Version Parquet du CSV si elle existe et est à jour
+        df = read_table(path)
         return df
     except Exception as e:
         st.error(f"Erreur lors du chargement du CSV: {e}")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Les scripts de src/scrapers s'importent entre eux par leur nom de module
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'scrapers'))
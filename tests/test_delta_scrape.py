@@ -0,0 +1,57 @@
+"""Mode delta : choix des compagnies à re-scraper et fusion avec le run précédent"""
+
+from datetime import datetime
+
+from delta_scrape import merge_results, select_delta_airlines
+from fleet_records import AirlineResult
+
+NOW = datetime(2026, 6, 1, 12, 0).timestamp()
+RECENT = '2026-05-25T12:00:00'
+OLD = '2026-04-01T12:00:00'
+
+
+def airline(code, count):
+    return {'code': code, 'name': code.upper(), 'sigle': '', 'aircraft_info': f"{count} aircraft"}
+
+
+def previous_result(code, count, status='success', scraped_at=RECENT):
+    return AirlineResult(code, code.upper(), status, total_aircraft=count,
+                         original_aircraft_info=f"{count} aircraft", scraped_at=scraped_at)
+
+
+def test_selection_reasons():
+    catalog = [airline('new', 3), airline('err', 5), airline('chg', 8), airline('old', 2), airline('same', 4)]
+    previous = {
+        'err': previous_result('err', 5, status='error'),
+        'chg': previous_result('chg', 7),
+        'old': previous_result('old', 2, scraped_at=OLD),
+        'same': previous_result('same', 4),
+    }
+    selected, reasons = select_delta_airlines(catalog, previous, max_age_days=30, now=NOW)
+    assert [item['code'] for item in selected] == ['new', 'err', 'chg', 'old']
+    assert reasons == {'nouvelle': 1, 'erreur': 1, 'modifiée': 1, 'ancienne': 1, 'inchangée': 1}
+
+
+def test_error_takes_precedence_over_changed_count():
+    previous = {'a': previous_result('a', 1, status='error')}
+    _, reasons = select_delta_airlines([airline('a', 9)], previous, now=NOW)
+    assert reasons == {'erreur': 1}
+
+
+def test_max_age_controls_staleness():
+    previous = {'a': previous_result('a', 2, scraped_at=OLD)}
+    assert select_delta_airlines([airline('a', 2)], previous, max_age_days=30, now=NOW)[1] == {'ancienne': 1}
+    assert select_delta_airlines([airline('a', 2)], previous, max_age_days=90, now=NOW)[1] == {'inchangée': 1}
+
+
+def test_merge_replaces_rows_by_code_in_catalog_order():
+    previous = {code: previous_result(code, 1) for code in ('a', 'b', 'gone')}
+    fresh = [previous_result('b', 5, scraped_at='2026-06-01T12:00:00'), previous_result('c', 2)]
+    catalog = [airline('c', 2), airline('a', 1), airline('b', 5)]
+    merged = merge_results(previous, fresh, catalog)
+    # Ordre du catalogue, puis les compagnies qui n'y sont plus
+    assert [result.code for result in merged] == ['c', 'a', 'b', 'gone']
+    by_code = {result.code: result for result in merged}
+    assert by_code['b'] is fresh[0]
+    assert by_code['a'] is previous['a']
+    assert len(merged) == len({result.code for result in merged})
@@ -0,0 +1,51 @@
+"""Scraper FlightRadar24 contre le serveur de replay local, avec le cache HTTP activé"""
+
+import asyncio
+
+import pytest
+
+from rate_limit import AIMDRateController
+from replay_server import ReplayServer
+from scraper_flightradar24 import FlightRadar24Scraper, aiohttp
+
+CODES = ['r00001', 'r00002', 'r00003', 'r00004', 'r00005']
+
+
+@pytest.fixture
+def server():
+    server = ReplayServer().start()
+    yield server
+    server.stop()
+
+
+def make_scraper(server, tmp_path):
+    scraper = FlightRadar24Scraper(cache_path=str(tmp_path / 'http_cache.sqlite'),
+                                   rate_controller=AIMDRateController(initial_rate=1000, max_rate=1000))
+    scraper.base_url = server.url
+    return scraper
+
+
+def test_sync_fetch_is_cached(server, tmp_path):
+    scraper = make_scraper(server, tmp_path)
+    first = [scraper.scrape_fleet_data(code, code) for code in CODES]
+    again = [scraper.scrape_fleet_data(code, code) for code in CODES]
+    assert all(result.ok for result in first + again)
+    assert [result.to_dict() for result in again] == [result.to_dict() for result in first]
+    assert server.status_counts == {200: len(CODES), 304: len(CODES)}
+
+
+@pytest.mark.skipif(aiohttp is None, reason="aiohttp non installé")
+def test_async_fetch_is_cached(server, tmp_path):
+    scraper = make_scraper(server, tmp_path)
+
+    async def fetch_all():
+        async with aiohttp.ClientSession() as http:
+            return [await scraper.scrape_fleet_data_async(http, code, code) for code in CODES]
+
+    first = asyncio.run(fetch_all())
+    assert [result.error for result in first] == [None] * len(CODES)
+    again = asyncio.run(fetch_all())
+    assert all(result.ok for result in again)
+    assert [result.to_dict() for result in again] == [result.to_dict() for result in first]
+    # Deuxième passe : pages revalidées (304), ni retéléchargées ni reparsées
+    assert server.status_counts == {200: len(CODES), 304: len(CODES)}
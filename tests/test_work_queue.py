@@ -0,0 +1,95 @@
+"""File de travail partagée : baux, expiration, reprise par un autre worker"""
+
+import pytest
+
+import work_queue
+from fleet_records import AirlineResult
+from work_queue import LeaseQueue
+
+AIRLINES = [{'code': 'a1', 'name': 'Alpha'}, {'code': 'b2', 'name': 'Bravo'}, {'code': 'c3', 'name': 'Charlie'}]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(work_queue.time, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    queue = LeaseQueue(str(tmp_path / 'queue.sqlite'), lease_seconds=60, max_attempts=3)
+    queue.enqueue(AIRLINES)
+    yield queue
+    queue.close()
+
+
+def success(code):
+    return AirlineResult(code, code, 'success', total_aircraft=1)
+
+
+def error(code):
+    return AirlineResult(code, code, 'error', error='HTTP 503')
+
+
+def leased_codes(leased):
+    return [airline['code'] for _, airline in leased]
+
+
+def test_lease_hands_out_each_code_once(queue):
+    assert leased_codes(queue.lease('w1', batch=2)) == ['a1', 'b2']
+    assert leased_codes(queue.lease('w2', batch=2)) == ['c3']
+    assert queue.lease('w3', batch=2) == []
+    assert queue.stats() == {'pending': 0, 'leased': 3, 'done': 0, 'failed': 0}
+
+
+def test_expired_lease_is_released_to_another_worker(queue, clock):
+    queue.lease('w1', batch=1)
+    clock.now += 30
+    assert leased_codes(queue.lease('w2', batch=1)) == ['b2']
+    clock.now += 31
+    # Bail de w1 expiré : a1 est repris par w2, le bail de b2 court toujours
+    assert leased_codes(queue.lease('w2', batch=3)) == ['a1', 'c3']
+    assert queue.renew('w1', ['a1']) == set()
+    assert queue.renew('w2', ['a1', 'b2']) == {'a1', 'b2'}
+
+
+def test_renew_keeps_the_whole_batch(queue, clock):
+    queue.lease('w1', batch=3)
+    clock.now += 50
+    assert queue.renew('w1', ['b2', 'c3']) == {'b2', 'c3'}
+    clock.now += 50
+    # a1 n'a pas été renouvelé : seul lui est repris
+    assert leased_codes(queue.lease('w2', batch=3)) == ['a1']
+
+
+def test_stale_complete_is_rejected(queue, clock):
+    queue.lease('w1', batch=1)
+    clock.now += 61
+    queue.lease('w2', batch=1)
+    assert queue.complete('w2', success('a1'))
+    # w1 termine après coup : ni son succès ni son échec n'écrasent le résultat de w2
+    assert not queue.complete('w1', success('a1'))
+    assert not queue.fail('w1', error('a1'))
+    assert queue.stats()['done'] == 1
+    assert [result.status for result in queue.iter_results()] == ['success']
+
+
+def test_fail_requeues_until_max_attempts(queue):
+    for attempt in range(1, 4):
+        assert leased_codes(queue.lease('w1', batch=1)) == ['a1']
+        assert queue.fail('w1', error('a1'))
+        expected = 'failed' if attempt == 3 else 'pending'
+        state, attempts = queue.conn.execute("SELECT state, attempts FROM jobs WHERE code = 'a1'").fetchone()
+        assert (state, attempts) == (expected, attempt)
+    # Échec définitif : a1 n'est plus distribué
+    assert leased_codes(queue.lease('w1', batch=3)) == ['b2', 'c3']
+    assert [result.code for result in queue.iter_results()] == ['a1']